@@ -1282,6 +1282,8 @@ def create_app() -> FastAPI:
                     cache = get_portfolio_cache()
                     await cache.warm_cache(analyzer)
                     logger.info("Portfolio cache warmed successfully")
+                    cache.start()
+                    await cache.listen_for_invalidations()
                 except Exception as e:
                     logger.warning(f"Failed to warm cache: {e}")
             else:
@@ -1313,6 +1315,13 @@ def create_app() -> FastAPI:
     @app.on_event("shutdown")
     async def shutdown():
         """Clean up resources on shutdown."""
+        # Send queued portfolio cache writes before Redis goes away
+        try:
+            from service.portfolio_cache import get_portfolio_cache
+            await get_portfolio_cache().stop()
+        except Exception:
+            pass
+
         # Close Redis connection
         try:
             from service.redis_client import close_redis
@@ -1320,6 +1329,21 @@ def create_app() -> FastAPI:
             logger.info("Redis connection closed")
         except Exception:
             pass
+
+        # Close shared notification HTTP session
+        try:
+            from service.notification_service import HAS_AIOHTTP, close_http_session
+            if HAS_AIOHTTP:
+                await close_http_session()
+        except Exception:
+            pass
+
+        # Close pooled SMTP connections
+        try:
+            from service.notification_service import close_smtp_connections
+            close_smtp_connections()
+        except Exception:
+            pass
         
         # Stop registry watcher
         try:
@@ -4,9 +4,11 @@ Human-in-the-Loop (HITL) Database Schema
 Stores requests from AI agents for human actions.
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, List, Sequence
 from enum import Enum
+import json
 
 
 class RequestType(str, Enum):
@@ -45,42 +47,26 @@ class FieldType(str, Enum):
     DATE = "date"
 
 
+@dataclass(slots=True, frozen=True)
 class HumanActionRequest:
     """Represents a request from an agent for human action."""
-    
-    def __init__(
-        self,
-        id: str,
-        request_type: str,
-        title: str,
-        description: str,
-        agent_id: str,
-        priority: str = "medium",
-        status: str = "pending",
-        workflow_id: Optional[str] = None,
-        context: Optional[Dict[str, Any]] = None,
-        required_fields: Optional[Dict[str, str]] = None,
-        response_data: Optional[Dict[str, Any]] = None,
-        created_at: Optional[str] = None,
-        fulfilled_at: Optional[str] = None,
-        fulfilled_by: Optional[str] = None,
-        notes: Optional[str] = None,
-    ):
-        self.id = id
-        self.request_type = request_type
-        self.title = title
-        self.description = description
-        self.agent_id = agent_id
-        self.priority = priority
-        self.status = status
-        self.workflow_id = workflow_id
-        self.context = context or {}
-        self.required_fields = required_fields or {}
-        self.response_data = response_data
-        self.created_at = created_at or datetime.now().isoformat()
-        self.fulfilled_at = fulfilled_at
-        self.fulfilled_by = fulfilled_by
-        self.notes = notes
+
+    id: str
+    request_type: str
+    title: str
+    description: str
+    agent_id: str
+    priority: str = "medium"
+    status: str = "pending"
+    workflow_id: Optional[str] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+    required_fields: Dict[str, str] = field(default_factory=dict)
+    response_data: Optional[Dict[str, Any]] = None
+    # Millisecond precision, matching timestamps stamped by SQL_NOW
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="milliseconds"))
+    fulfilled_at: Optional[str] = None
+    fulfilled_by: Optional[str] = None
+    notes: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -102,8 +88,74 @@ class HumanActionRequest:
         }
 
 
+# Column order used by HumanActionRequest.from_row
+HITL_REQUEST_COLUMNS = (
+    "id",
+    "request_type",
+    "title",
+    "description",
+    "agent_id",
+    "priority",
+    "status",
+    "workflow_id",
+    "context",
+    "required_fields",
+    "response_data",
+    "created_at",
+    "fulfilled_at",
+    "fulfilled_by",
+    "notes",
+)
+
+HITL_REQUEST_COLUMN_LIST = ", ".join(HITL_REQUEST_COLUMNS)
+
+SELECT_HITL_REQUESTS = "SELECT " + HITL_REQUEST_COLUMN_LIST + " FROM hitl_requests"
+
+# JSON-encoded columns and the value used when the column is empty
+HITL_REQUEST_JSON_COLUMNS = {
+    "context": "{}",
+    "required_fields": "{}",
+    "response_data": "None",
+}
+
+
+def compile_row_factory(
+    cls: type,
+    columns: Sequence[str],
+    json_columns: Optional[Dict[str, str]] = None,
+) -> Callable[[Sequence[Any]], Any]:
+    """
+    Generate a specialized function that builds ``cls`` from a positional row.
+
+    The constructor call is emitted as source with one ``r[i]`` per column,
+    so per-row conversion does no name lookups or loops. JSON columns are
+    decoded when non-empty and otherwise replaced by their fallback expression.
+    """
+    json_columns = json_columns or {}
+    args = []
+    for index, column in enumerate(columns):
+        if column in json_columns:
+            args.append(f"{column}=_loads(r[{index}]) if r[{index}] else {json_columns[column]}")
+        else:
+            args.append(f"{column}=r[{index}]")
+    source = f"def from_row(r):\n    return _cls({', '.join(args)})\n"
+    namespace: Dict[str, Any] = {"_cls": cls, "_loads": json.loads}
+    exec(source, namespace)
+    return namespace["from_row"]
+
+
+# Build a HumanActionRequest from a row selected in HITL_REQUEST_COLUMNS order
+HumanActionRequest.from_row = staticmethod(
+    compile_row_factory(HumanActionRequest, HITL_REQUEST_COLUMNS, HITL_REQUEST_JSON_COLUMNS)
+)
+
+# SQLite expression for the current local time in isoformat with millisecond
+# precision, used for request timestamps
+SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+
 # SQL Schema for SQLite
-CREATE_HITL_REQUESTS_TABLE = """
+CREATE_HITL_REQUESTS_TABLE = f"""
 CREATE TABLE IF NOT EXISTS hitl_requests (
     id TEXT PRIMARY KEY,
     request_type TEXT NOT NULL,
@@ -116,7 +168,7 @@ CREATE TABLE IF NOT EXISTS hitl_requests (
     context TEXT,  -- JSON
     required_fields TEXT,  -- JSON
     response_data TEXT,  -- JSON  
-    created_at TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT ({SQL_NOW}),
     fulfilled_at TEXT,
     fulfilled_by TEXT,
     notes TEXT
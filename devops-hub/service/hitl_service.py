@@ -4,20 +4,32 @@ Human-in-the-Loop (HITL) Service
 Manages requests from AI agents for human actions.
 """
 
-from datetime import datetime
 from typing import Optional, Dict, Any, List
-from uuid import uuid4
 import json
 import logging
+import secrets
+import struct
+import time
 
 from service.hitl_schema import (
     HumanActionRequest,
     CREATE_HITL_REQUESTS_TABLE,
+    HITL_REQUEST_COLUMN_LIST,
+    SELECT_HITL_REQUESTS,
+    SQL_NOW,
 )
 from core.database import get_database
 
 logger = logging.getLogger(__name__)
 
+# Statuses from which a request can still be fulfilled or rejected
+_OPEN_STATUSES = frozenset({"pending", "in_review"})
+
+
+def _new_request_id() -> str:
+    """Generate a request ID: 32-bit seconds prefix plus 32 random bits, sortable by creation time."""
+    return "har_" + struct.pack(">I", int(time.time())).hex() + secrets.token_hex(4)
+
 
 class HITLService:
     """Service for managing human-in-the-loop requests."""
@@ -48,8 +60,34 @@ class HITLService:
         context: Optional[Dict[str, Any]] = None,
     ) -> HumanActionRequest:
         """Create a new human action request."""
-        request_id = f"har_{uuid4().hex[:12]}"
-        now = datetime.now().isoformat()
+        request_id = _new_request_id()
+        context = context or {}
+        required_fields = required_fields or {}
+
+        # Save to database; created_at is stamped by SQLite and returned
+        with self.db.cursor() as cur:
+            cur.execute(
+                f"""
+                INSERT INTO hitl_requests (
+                    id, request_type, title, description, agent_id, priority, status,
+                    workflow_id, context, required_fields, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {SQL_NOW})
+                RETURNING created_at
+                """,
+                (
+                    request_id,
+                    request_type,
+                    title,
+                    description,
+                    agent_id,
+                    priority,
+                    "pending",
+                    workflow_id,
+                    json.dumps(context),
+                    json.dumps(required_fields),
+                ),
+            )
+            created_at = cur.fetchone()[0]
 
         request = HumanActionRequest(
             id=request_id,
@@ -60,32 +98,9 @@ class HITLService:
             priority=priority,
             status="pending",
             workflow_id=workflow_id,
-            context=context or {},
-            required_fields=required_fields or {},
-            created_at=now,
-        )
-
-        # Save to database
-        self.db.execute(
-            """
-            INSERT INTO hitl_requests (
-                id, request_type, title, description, agent_id, priority, status,
-                workflow_id, context, required_fields, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                request.id,
-                request.request_type,
-                request.title,
-                request.description,
-                request.agent_id,
-                request.priority,
-                request.status,
-                request.workflow_id,
-                json.dumps(request.context),
-                json.dumps(request.required_fields),
-                request.created_at,
-            ),
+            context=context,
+            required_fields=required_fields,
+            created_at=created_at,
         )
 
         logger.info(f"Created HITL request {request.id} for agent {agent_id}")
@@ -93,12 +108,10 @@ class HITLService:
 
     def get_request(self, request_id: str) -> Optional[HumanActionRequest]:
         """Get a request by ID."""
-        row = self.db.fetch_one(
-            "SELECT * FROM hitl_requests WHERE id = ?", (request_id,)
-        )
-        if not row:
+        rows = self._fetch_rows(SELECT_HITL_REQUESTS + " WHERE id = ?", (request_id,))
+        if not rows:
             return None
-        return self._dict_to_request(row)
+        return HumanActionRequest.from_row(rows[0])
 
     def list_requests(
         self,
@@ -109,7 +122,7 @@ class HITLService:
         offset: int = 0,
     ) -> List[HumanActionRequest]:
         """List requests with optional filters."""
-        query = "SELECT * FROM hitl_requests WHERE 1=1"
+        query = SELECT_HITL_REQUESTS + " WHERE 1=1"
         params = []
 
         if status:
@@ -125,8 +138,9 @@ class HITLService:
         query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        rows = self.db.fetch_all(query, tuple(params))
-        return [self._dict_to_request(row) for row in rows]
+        rows = self._fetch_rows(query, tuple(params))
+        from_row = HumanActionRequest.from_row
+        return [from_row(row) for row in rows]
 
     def fulfill_request(
         self,
@@ -140,21 +154,19 @@ class HITLService:
         if not request:
             return None
 
-        if request.status not in ["pending", "in_review"]:
+        if request.status not in _OPEN_STATUSES:
             raise ValueError(f"Request {request_id} cannot be fulfilled (status: {request.status})")
 
-        now = datetime.now().isoformat()
-
-        self.db.execute(
-            """
+        rows = self._fetch_rows(
+            f"""
             UPDATE hitl_requests
-            SET status = ?, response_data = ?, fulfilled_at = ?, fulfilled_by = ?, notes = ?
+            SET status = ?, response_data = ?, fulfilled_at = {SQL_NOW}, fulfilled_by = ?, notes = ?
             WHERE id = ?
+            RETURNING {HITL_REQUEST_COLUMN_LIST}
             """,
             (
                 "fulfilled",
                 json.dumps(response_data),
-                now,
                 fulfilled_by,
                 notes,
                 request_id,
@@ -162,7 +174,7 @@ class HITLService:
         )
 
         logger.info(f"Fulfilled HITL request {request_id} by {fulfilled_by}")
-        return self.get_request(request_id)
+        return HumanActionRequest.from_row(rows[0]) if rows else None
 
     def reject_request(
         self,
@@ -175,20 +187,18 @@ class HITLService:
         if not request:
             return None
 
-        if request.status not in ["pending", "in_review"]:
+        if request.status not in _OPEN_STATUSES:
             raise ValueError(f"Request {request_id} cannot be rejected (status: {request.status})")
 
-        now = datetime.now().isoformat()
-
-        self.db.execute(
-            """
+        rows = self._fetch_rows(
+            f"""
             UPDATE hitl_requests
-            SET status = ?, fulfilled_at = ?, fulfilled_by = ?, notes = ?
+            SET status = ?, fulfilled_at = {SQL_NOW}, fulfilled_by = ?, notes = ?
             WHERE id = ?
+            RETURNING {HITL_REQUEST_COLUMN_LIST}
             """,
             (
                 "rejected",
-                now,
                 rejected_by,
                 reason,
                 request_id,
@@ -196,71 +206,53 @@ class HITLService:
         )
 
         logger.info(f"Rejected HITL request {request_id} by {rejected_by}: {reason}")
-        return self.get_request(request_id)
+        return HumanActionRequest.from_row(rows[0]) if rows else None
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get HITL request statistics."""
-        total_row = self.db.fetch_one("SELECT COUNT(*) as count FROM hitl_requests")
-        total = total_row['count'] if total_row else 0
-
-        # By status
-        status_rows = self.db.fetch_all(
-            "SELECT status, COUNT(*) as count FROM hitl_requests GROUP BY status"
-        )
-        by_status = {row['status']: row['count'] for row in status_rows}
-
-        # By priority
-        priority_rows = self.db.fetch_all(
-            "SELECT priority, COUNT(*) as count FROM hitl_requests GROUP BY priority"
-        )
-        by_priority = {row['priority']: row['count'] for row in priority_rows}
-
-        # By type
-        type_rows = self.db.fetch_all(
-            "SELECT request_type, COUNT(*) as count FROM hitl_requests GROUP BY request_type"
+        # Totals, pending count and average response time (for fulfilled requests)
+        totals_row = self.db.fetch_one(
+            """
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN status IN ('pending', 'in_review') THEN 1 ELSE 0 END) as pending_total,
+                ROUND(AVG(
+                    CASE WHEN status = 'fulfilled' AND fulfilled_at IS NOT NULL
+                    THEN (julianday(fulfilled_at) - julianday(created_at)) * 24
+                    END
+                ), 2) as avg_hours
+            FROM hitl_requests
+            """
         )
-        by_type = {row['request_type']: row['count'] for row in type_rows}
 
-        # Average response time (for fulfilled requests)
-        avg_response_row = self.db.fetch_one(
+        # By status, priority and type
+        group_rows = self._fetch_rows(
             """
-            SELECT AVG(
-                (julianday(fulfilled_at) - julianday(created_at)) * 24
-            ) as avg_hours
-            FROM hitl_requests
-            WHERE status = 'fulfilled' AND fulfilled_at IS NOT NULL
+            SELECT 'status', status, COUNT(*) FROM hitl_requests GROUP BY status
+            UNION ALL
+            SELECT 'priority', priority, COUNT(*) FROM hitl_requests GROUP BY priority
+            UNION ALL
+            SELECT 'type', request_type, COUNT(*) FROM hitl_requests GROUP BY request_type
             """
         )
-        avg_response_hours = avg_response_row['avg_hours'] if avg_response_row and avg_response_row['avg_hours'] else 0.0
+        groups: Dict[str, Dict[str, int]] = {"status": {}, "priority": {}, "type": {}}
+        for group, key, count in group_rows:
+            groups[group][key] = count
 
         return {
-            "total_requests": total,
-            "pending_requests": by_status.get("pending", 0) + by_status.get("in_review", 0),
-            "by_status": by_status,
-            "by_priority": by_priority,
-            "by_type": by_type,
-            "average_response_time_hours": round(avg_response_hours, 2),
+            "total_requests": totals_row['total'],
+            "pending_requests": totals_row['pending_total'] or 0,
+            "by_status": groups["status"],
+            "by_priority": groups["priority"],
+            "by_type": groups["type"],
+            "average_response_time_hours": totals_row['avg_hours'] or 0.0,
         }
 
-    def _dict_to_request(self, row: Dict[str, Any]) -> HumanActionRequest:
-        """Convert database row dict to HumanActionRequest object."""
-        return HumanActionRequest(
-            id=row['id'],
-            request_type=row['request_type'],
-            title=row['title'],
-            description=row['description'],
-            agent_id=row['agent_id'],
-            priority=row['priority'],
-            status=row['status'],
-            workflow_id=row.get('workflow_id'),
-            context=json.loads(row['context']) if row.get('context') else {},
-            required_fields=json.loads(row['required_fields']) if row.get('required_fields') else {},
-            response_data=json.loads(row['response_data']) if row.get('response_data') else None,
-            created_at=row['created_at'],
-            fulfilled_at=row.get('fulfilled_at'),
-            fulfilled_by=row.get('fulfilled_by'),
-            notes=row.get('notes'),
-        )
+    def _fetch_rows(self, query: str, params: tuple = ()) -> List[Any]:
+        """Fetch raw rows, skipping the dict conversion done by Database.fetch_all."""
+        with self.db.cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
 
 
 # Singleton instance
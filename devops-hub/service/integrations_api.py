@@ -22,11 +22,18 @@ from core.integrations import (
     get_user_settings_repository,
 )
 from core.auth import get_api_key, require_write, APIKey
+from service.notification_service import invalidate_integration_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/integrations", tags=["Integrations"])
 
+# Value -> enum lookup tables, built once instead of per request
+INTEGRATION_TYPE_MAP: Dict[str, IntegrationType] = {t.value: t for t in IntegrationType}
+INTEGRATION_TYPE_VALUES = list(INTEGRATION_TYPE_MAP)
+CREDENTIAL_TYPE_MAP: Dict[str, CredentialType] = {t.value: t for t in CredentialType}
+CREDENTIAL_TYPE_VALUES = list(CREDENTIAL_TYPE_MAP)
+
 
 # Request/Response Models
 
@@ -108,12 +115,11 @@ async def create_integration(
     api_key: APIKey = Depends(require_write()),
 ):
     """Create a new integration."""
-    try:
-        integration_type = IntegrationType(request.type)
-    except ValueError:
+    integration_type = INTEGRATION_TYPE_MAP.get(request.type)
+    if integration_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid integration type: {request.type}. Valid types: {[t.value for t in IntegrationType]}"
+            detail=f"Invalid integration type: {request.type}. Valid types: {INTEGRATION_TYPE_VALUES}"
         )
 
     repo = get_integration_repository()
@@ -124,6 +130,8 @@ async def create_integration(
         api_key_id=api_key.id,
     )
 
+    invalidate_integration_cache(integration.id)
+
     logger.info(f"Created integration: {integration.name} ({integration.type.value})")
     return _integration_to_response(integration, has_credentials=False)
 
@@ -138,14 +146,13 @@ async def list_integrations(
     cred_repo = get_credential_repository()
 
     if type:
-        try:
-            integration_type = IntegrationType(type)
-            integrations = repo.list_by_type(integration_type)
-        except ValueError:
+        integration_type = INTEGRATION_TYPE_MAP.get(type)
+        if integration_type is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid integration type: {type}"
             )
+        integrations = repo.list_by_type(integration_type)
     else:
         integrations = repo.list_by_owner(api_key.id) if api_key else repo.list_all_active()
 
@@ -203,6 +210,8 @@ async def update_integration(
             detail=f"Integration not found: {integration_id}"
         )
 
+    invalidate_integration_cache(integration_id)
+
     cred_repo = get_credential_repository()
     has_creds = cred_repo.retrieve(integration.id, CredentialType.API_KEY) is not None
 
@@ -218,6 +227,7 @@ async def delete_integration(
     """Delete an integration and its credentials."""
     repo = get_integration_repository()
     if repo.delete(integration_id):
+        invalidate_integration_cache(integration_id)
         logger.info(f"Deleted integration: {integration_id}")
         return {"deleted": True, "id": integration_id}
     raise HTTPException(
@@ -233,12 +243,11 @@ async def store_credential(
     api_key: APIKey = Depends(require_write()),
 ):
     """Store a credential for an integration."""
-    try:
-        credential_type = CredentialType(request.credential_type)
-    except ValueError:
+    credential_type = CREDENTIAL_TYPE_MAP.get(request.credential_type)
+    if credential_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid credential type: {request.credential_type}. Valid types: {[t.value for t in CredentialType]}"
+            detail=f"Invalid credential type: {request.credential_type}. Valid types: {CREDENTIAL_TYPE_VALUES}"
         )
 
     # Verify integration exists
@@ -258,6 +267,8 @@ async def store_credential(
         metadata=request.metadata,
     )
 
+    invalidate_integration_cache(integration_id)
+
     logger.info(f"Stored {credential_type.value} credential for integration {integration_id}")
     return {
         "stored": True,
@@ -273,9 +284,8 @@ async def delete_credential(
     api_key: APIKey = Depends(require_write()),
 ):
     """Delete a credential from an integration."""
-    try:
-        cred_type = CredentialType(credential_type)
-    except ValueError:
+    cred_type = CREDENTIAL_TYPE_MAP.get(credential_type)
+    if cred_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid credential type: {credential_type}"
@@ -283,6 +293,7 @@ async def delete_credential(
 
     cred_repo = get_credential_repository()
     if cred_repo.delete(integration_id, cred_type):
+        invalidate_integration_cache(integration_id)
         return {"deleted": True}
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -407,8 +418,8 @@ async def update_notification_preferences(
 # Helper Functions
 
 def _integration_to_response(integration: Integration, has_credentials: bool) -> IntegrationResponse:
-    """Convert Integration to response model."""
-    return IntegrationResponse(
+    """Convert Integration to response model (fields come from the repository, so validation is skipped)."""
+    return IntegrationResponse.model_construct(
         id=integration.id,
         name=integration.name,
         type=integration.type.value,
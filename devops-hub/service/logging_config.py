@@ -4,22 +4,94 @@ Structured Logging Configuration - Production-ready logging with JSON support.
 Provides configurable logging that supports:
 - Human-readable format for development
 - JSON format for production (log aggregation tools like ELK, Datadog)
+- Optional MessagePack-over-TCP shipping straight to Logstash (LOG_TRANSPORT)
 - Request ID tracing for distributed debugging
 - Configurable log levels per module
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
 import json
 import os
+import queue
 import sys
+import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+# Use orjson for JSON log serialization if available, fall back to json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Use msgpack for log shipping over TCP if available, fall back to JSON lines
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
 
 # Context variable for request-scoped data
 request_id_var: ContextVar[str] = ContextVar('request_id', default='')
 
+# Standard LogRecord attributes that are not emitted as extra fields
+_RESERVED_RECORD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'created', 'filename', 'funcName',
+    'levelname', 'levelno', 'lineno', 'module', 'msecs',
+    'pathname', 'process', 'processName', 'relativeCreated',
+    'stack_info', 'exc_info', 'exc_text', 'thread', 'threadName',
+    'message', 'asctime', 'taskName',
+})
+
+# Extra field value types emitted as-is; anything else is logged as str(value)
+_JSON_NATIVE_TYPES = (str, int, float, bool, type(None), list, dict)
+
+# Number of attributes on a LogRecord that carries no extra fields
+_BASE_RECORD_ATTR_COUNT = len(logging.LogRecord("", logging.INFO, "", 0, "", None, None).__dict__)
+
+# Second-precision timestamp strings, reused for records within the same second
+_utc_second_cache = [-1, ""]
+_local_second_cache = [-1, ""]
+
+
+def _utc_timestamp(created: float) -> str:
+    """Format a record creation time as ISO 8601 UTC with millisecond precision."""
+    second = int(created)
+    if second != _utc_second_cache[0]:
+        _utc_second_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _utc_second_cache[0] = second
+    return f"{_utc_second_cache[1]}.{int((created - second) * 1000):03d}Z"
+
+
+def _local_timestamp(created: float) -> str:
+    """Format a record creation time as local 'YYYY-MM-DD HH:MM:SS'."""
+    second = int(created)
+    if second != _local_second_cache[0]:
+        _local_second_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        _local_second_cache[0] = second
+    return _local_second_cache[1]
+
+
+def _record_message(record: logging.LogRecord) -> str:
+    """Equivalent to record.getMessage(), skipping the % step when there are no args."""
+    msg = record.msg
+    if not isinstance(msg, str):
+        msg = str(msg)
+    if record.args:
+        msg = msg % record.args
+    return msg
+
+
+def _record_request_id(record: logging.LogRecord) -> str:
+    """Get the request ID captured on the record, or the current context's."""
+    return record.__dict__.get("request_id") or request_id_var.get()
+
 
 class JSONFormatter(logging.Formatter):
     """
@@ -33,16 +105,33 @@ class JSONFormatter(logging.Formatter):
         self.service_name = service_name
 
     def format(self, record: logging.LogRecord) -> str:
+        if HAS_ORJSON:
+            return orjson.dumps(
+                self._build_log_data(record), default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        return json.dumps(self._build_log_data(record), default=str)
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format a record as a newline-terminated UTF-8 JSON line."""
+        if HAS_ORJSON:
+            return orjson.dumps(
+                self._build_log_data(record),
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+            )
+        return (json.dumps(self._build_log_data(record), default=str) + "\n").encode("utf-8")
+
+    def _build_log_data(self, record: logging.LogRecord) -> Dict[str, Any]:
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _utc_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
-            "message": record.getMessage(),
+            "message": _record_message(record),
             "service": self.service_name,
         }
 
         # Add request ID if available
-        request_id = request_id_var.get()
+        request_id = _record_request_id(record)
         if request_id:
             log_data["request_id"] = request_id
 
@@ -61,18 +150,115 @@ class JSONFormatter(logging.Formatter):
                 "traceback": self.formatException(record.exc_info),
             }
 
-        # Add extra fields
-        for key, value in record.__dict__.items():
-            if key not in (
-                'name', 'msg', 'args', 'created', 'filename', 'funcName',
-                'levelname', 'levelno', 'lineno', 'module', 'msecs',
-                'pathname', 'process', 'processName', 'relativeCreated',
-                'stack_info', 'exc_info', 'exc_text', 'thread', 'threadName',
-                'message', 'asctime', 'taskName'
-            ):
-                log_data[key] = value
+        # Add extra fields; most records have none, so skip the scan for them
+        record_attrs = record.__dict__
+        if len(record_attrs) > _BASE_RECORD_ATTR_COUNT:
+            is_reserved = _RESERVED_RECORD_ATTRS.__contains__
+            for key, value in record_attrs.items():
+                if not is_reserved(key):
+                    # Coerce unknown types here so the serializer stays on its native path
+                    log_data[key] = value if isinstance(value, _JSON_NATIVE_TYPES) else str(value)
+
+        return log_data
 
-        return json.dumps(log_data, default=str)
+
+class MessagePackFormatter(JSONFormatter):
+    """
+    MessagePack log formatter for shipping records to Logstash.
+
+    Builds the same fields as JSONFormatter, but format_bytes packs them with
+    msgpack for a Logstash tcp input using `codec => msgpack`. format() still
+    returns JSON text for handlers that need a str.
+    """
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format a record as a single MessagePack map."""
+        return msgpack.packb(self._build_log_data(record), use_bin_type=True, default=str)
+
+
+class TCPLogHandler(logging.handlers.SocketHandler):
+    """
+    Socket handler that sends formatter bytes instead of pickled records.
+
+    The formatter must provide format_bytes (JSONFormatter or
+    MessagePackFormatter). Connection handling and reconnect backoff are
+    inherited from SocketHandler.
+    """
+
+    def makePickle(self, record: logging.LogRecord) -> bytes:
+        return self.formatter.format_bytes(record)
+
+
+def _parse_log_transport(transport: str) -> Optional[Tuple[str, int]]:
+    """Parse a LOG_TRANSPORT value like 'tcp://logstash:5044' into (host, port)."""
+    parts = urlsplit(transport)
+    if parts.scheme != "tcp" or not parts.hostname:
+        return None
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    if port is None:
+        return None
+    return parts.hostname, port
+
+
+class BytesStreamHandler(logging.StreamHandler):
+    """
+    Stream handler that writes JSONFormatter output straight to a binary stream.
+
+    Skips the str round-trip of StreamHandler: the formatter produces the
+    encoded line and it is written to e.g. sys.stdout.buffer as-is.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(stream if stream is not None else sys.stdout.buffer)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.formatter.format_bytes(record))
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that hands records to a QueueListener thread.
+
+    The request ID context var is captured on the record before it leaves
+    the calling context, and exc_info is kept so formatters on the listener
+    side can still render structured exception data. Like the stdlib
+    QueueHandler it works on a copy, leaving the original record untouched
+    for any other handler processing it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = _record_message(record)
+        record.args = None
+        if "request_id" not in record.__dict__:
+            request_id = request_id_var.get()
+            if request_id:
+                record.request_id = request_id
+        return record
+
+
+# Background listener that owns the real output handler
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_queue_listener() -> None:
+    """Stop the logging queue listener, flushing any queued records."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -94,14 +280,14 @@ class ColoredFormatter(logging.Formatter):
         color = self.COLORS.get(record.levelname, '')
 
         # Add request ID if available
-        request_id = request_id_var.get()
+        request_id = _record_request_id(record)
         request_id_str = f"[{request_id[:8]}] " if request_id else ""
 
         # Format timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = _local_timestamp(record.created)
 
         # Build message
-        message = record.getMessage()
+        message = _record_message(record)
 
         formatted = (
             f"{color}{timestamp} {record.levelname:8}{self.RESET} "
@@ -127,6 +313,10 @@ def configure_logging(
         log_level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_format: If True, use JSON format; if False, use colored format
         service_name: Service name for JSON logs
+
+    If LOG_TRANSPORT is set to tcp://host:port, records are sent to that
+    address (e.g. a Logstash tcp input) instead of stdout: MessagePack when
+    msgpack is installed, otherwise newline-delimited JSON.
     """
     # Get configuration from environment if not provided
     if log_level is None:
@@ -146,27 +336,54 @@ def configure_logging(
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
+    log_transport = os.environ.get("LOG_TRANSPORT", "")
+    tcp_address = _parse_log_transport(log_transport) if log_transport else None
 
-    # Set formatter based on configuration
-    if json_format:
-        formatter = JSONFormatter(service_name=service_name)
+    if tcp_address:
+        # Ship records directly to the log collector
+        console_handler = TCPLogHandler(*tcp_address)
+        if HAS_MSGPACK:
+            formatter = MessagePackFormatter(service_name=service_name)
+        else:
+            formatter = JSONFormatter(service_name=service_name)
     else:
-        formatter = ColoredFormatter()
+        # Create console handler; JSON lines go to the binary stdout buffer when available
+        if json_format and hasattr(sys.stdout, "buffer"):
+            console_handler = BytesStreamHandler(sys.stdout.buffer)
+        else:
+            console_handler = logging.StreamHandler(sys.stdout)
+
+        # Set formatter based on configuration
+        if json_format:
+            formatter = JSONFormatter(service_name=service_name)
+        else:
+            formatter = ColoredFormatter()
 
+    console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+
+    # Callers only enqueue records; a listener thread formats and writes them
+    global _queue_listener
+    _stop_queue_listener()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(ContextQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
 
     # Configure specific loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.error").setLevel(numeric_level)
 
     # Log configuration
-    root_logger.info(
-        f"Logging configured: level={log_level}, format={'json' if json_format else 'colored'}"
-    )
+    if tcp_address:
+        log_format = "msgpack" if HAS_MSGPACK else "json"
+    else:
+        log_format = "json" if json_format else "colored"
+    root_logger.info(f"Logging configured: level={log_level}, format={log_format}")
+    if log_transport and not tcp_address:
+        root_logger.warning(f"Ignoring invalid LOG_TRANSPORT {log_transport!r}; expected tcp://host:port")
 
 
 def get_request_id() -> str:
@@ -198,12 +415,17 @@ def clear_request_id() -> None:
 class LoggerAdapter(logging.LoggerAdapter):
     """
     Logger adapter that automatically includes extra context.
+
+    The logging methods inherited from logging.LoggerAdapter check
+    isEnabledFor before calling process, so disabled levels skip it entirely.
     """
 
     def process(self, msg: str, kwargs: Dict[str, Any]) -> tuple:
-        extra = kwargs.get('extra', {})
-        extra['request_id'] = get_request_id()
-        kwargs['extra'] = extra
+        extra = kwargs.get('extra')
+        if extra is None:
+            kwargs['extra'] = {'request_id': request_id_var.get()}
+        else:
+            extra['request_id'] = request_id_var.get()
         return msg, kwargs
 
 
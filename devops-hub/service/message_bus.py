@@ -6,14 +6,32 @@ Enables agents to communicate asynchronously through events and messages.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable, Awaitable
+from typing import Any, Dict, List, Optional, Callable, Awaitable, Tuple
 from uuid import uuid4
 from enum import Enum
-from collections import defaultdict
+from collections import deque
 import asyncio
+import json
 import logging
 
+# Use orjson for event serialization if available, fall back to json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Count published events in the prometheus metrics if available
+try:
+    from service.metrics import track_event_published
+    HAS_METRICS = True
+except ImportError:
+    HAS_METRICS = False
+
 logger = logging.getLogger(__name__)
+_LOG_ERR = logger.error
+
+EventHandler = Callable[["Event"], Awaitable[None]]
 
 
 class EventType(str, Enum):
@@ -32,10 +50,10 @@ class EventType(str, Enum):
     CUSTOM = "custom"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """An event in the message bus."""
-    id: str = field(default_factory=lambda: str(uuid4()))
+    id: str = field(default_factory=lambda: uuid4().hex)
     type: str = ""
     source: str = ""
     data: Dict[str, Any] = field(default_factory=dict)
@@ -54,11 +72,29 @@ class Event:
             "metadata": self.metadata,
         }
 
-
-@dataclass
+    def to_json(self) -> bytes:
+        """Serialize the event as UTF-8 JSON, matching to_dict()."""
+        if HAS_ORJSON:
+            return orjson.dumps(
+                {
+                    "id": self.id,
+                    "type": self.type,
+                    "source": self.source,
+                    "data": self.data,
+                    "timestamp": self.timestamp,
+                    "correlation_id": self.correlation_id,
+                    "metadata": self.metadata,
+                },
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+        return json.dumps(self.to_dict(), default=str).encode("utf-8")
+
+
+@dataclass(slots=True)
 class Subscription:
     """A subscription to events."""
-    id: str = field(default_factory=lambda: str(uuid4()))
+    id: str = field(default_factory=lambda: uuid4().hex)
     event_type: str = "*"  # "*" means all events
     handler: Callable[[Event], Awaitable[None]] = None
     filter_source: Optional[str] = None
@@ -73,42 +109,63 @@ class MessageBus:
     - Publish/subscribe pattern
     - Event filtering by type and source
     - Event history for replay
-    - Async event handling
+    - Async event handling, with handlers run concurrently by default
+
+    Handlers for an event run in this order: handlers for its type without
+    a source filter, then those for its type whose filter matches, then the
+    same two groups of wildcard ("*") handlers. Each group keeps
+    subscription order.
     """
 
-    def __init__(self, history_size: int = 1000):
-        self._subscriptions: Dict[str, List[Subscription]] = defaultdict(list)
-        self._event_history: List[Event] = []
+    def __init__(self, history_size: int = 1000, concurrent_dispatch: bool = True):
+        # Subscription tables hold immutable tuples that subscribe/unsubscribe
+        # replace wholesale, so publish can iterate a snapshot without locking
+        self._subscriptions: Dict[str, Tuple[Subscription, ...]] = {}
+        # Dispatch indexes: handlers without a source filter by event type,
+        # and source-filtered handlers by (event type, source)
+        self._by_type_any: Dict[str, Tuple[EventHandler, ...]] = {}
+        self._by_type_src: Dict[Tuple[str, str], Tuple[EventHandler, ...]] = {}
+        self._subscriptions_by_id: Dict[str, Subscription] = {}
+        # Bounded history; deque appends are atomic so publish needs no lock
+        self._event_history: deque = deque(maxlen=history_size)
         self._history_size = history_size
-        self._lock = asyncio.Lock()
+        self._concurrent_dispatch = concurrent_dispatch
 
     async def publish(self, event: Event) -> None:
         """Publish an event to all subscribers."""
-        async with self._lock:
-            # Store in history
-            self._event_history.append(event)
-            if len(self._event_history) > self._history_size:
-                self._event_history = self._event_history[-self._history_size:]
-
-        # Get matching subscribers
-        handlers = []
-
-        # Exact type match
-        for sub in self._subscriptions.get(event.type, []):
-            if sub.filter_source is None or sub.filter_source == event.source:
-                handlers.append(sub.handler)
-
-        # Wildcard subscribers
-        for sub in self._subscriptions.get("*", []):
-            if sub.filter_source is None or sub.filter_source == event.source:
-                handlers.append(sub.handler)
-
-        # Execute handlers
+        # Store in history
+        self._event_history.append(event)
+        if HAS_METRICS:
+            track_event_published(event.type, event.source)
+
+        # Get matching subscribers: exact type first, then wildcard
+        by_type_any = self._by_type_any
+        by_type_src = self._by_type_src
+        handlers = (
+            by_type_any.get(event.type, ())
+            + by_type_src.get((event.type, event.source), ())
+            + by_type_any.get("*", ())
+            + by_type_src.get(("*", event.source), ())
+        )
+
+        # Execute handlers; concurrently so a slow handler doesn't delay the others
+        if self._concurrent_dispatch and len(handlers) > 1:
+            await asyncio.gather(*(self._run_handler(handler, event) for handler in handlers))
+            return
+
         for handler in handlers:
             try:
                 await handler(event)
             except Exception as e:
-                logger.error(f"Error in event handler: {e}")
+                _LOG_ERR("Error in handler %r for event %s: %r", handler, event.type, e)
+
+    @staticmethod
+    async def _run_handler(handler: EventHandler, event: Event) -> None:
+        """Run one handler, logging its error so it can't affect the others."""
+        try:
+            await handler(event)
+        except Exception as e:
+            _LOG_ERR("Error in handler %r for event %s: %r", handler, event.type, e)
 
     def subscribe(
         self,
@@ -122,17 +179,31 @@ class MessageBus:
             handler=handler,
             filter_source=filter_source,
         )
-        self._subscriptions[event_type].append(sub)
+        self._subscriptions[event_type] = self._subscriptions.get(event_type, ()) + (sub,)
+        self._subscriptions_by_id[sub.id] = sub
+        table, key = self._handler_index(sub)
+        table[key] = table.get(key, ()) + (handler,)
         return sub.id
 
     def unsubscribe(self, subscription_id: str) -> bool:
         """Unsubscribe from events."""
-        for event_type, subs in self._subscriptions.items():
-            for sub in subs:
-                if sub.id == subscription_id:
-                    subs.remove(sub)
-                    return True
-        return False
+        sub = self._subscriptions_by_id.pop(subscription_id, None)
+        if sub is None:
+            return False
+        self._subscriptions[sub.event_type] = tuple(
+            s for s in self._subscriptions[sub.event_type] if s is not sub
+        )
+        table, key = self._handler_index(sub)
+        handlers = list(table[key])
+        handlers.remove(sub.handler)
+        table[key] = tuple(handlers)
+        return True
+
+    def _handler_index(self, sub: Subscription) -> Tuple[Dict[Any, Tuple[EventHandler, ...]], Any]:
+        """Get the dispatch table and key a subscription's handler is filed under."""
+        if sub.filter_source is None:
+            return self._by_type_any, sub.event_type
+        return self._by_type_src, (sub.event_type, sub.filter_source)
 
     def get_history(
         self,
@@ -141,7 +212,7 @@ class MessageBus:
         limit: int = 100,
     ) -> List[Event]:
         """Get event history with optional filters."""
-        events = self._event_history
+        events = list(self._event_history)
 
         if event_type:
             events = [e for e in events if e.type == event_type]
@@ -155,59 +226,76 @@ class MessageBus:
         """Get subscription counts by event type."""
         return {k: len(v) for k, v in self._subscriptions.items()}
 
-    # Convenience methods for common events
+    # Convenience methods for common events. The kwargs dict is fresh per
+    # call, so the standard fields are added to it and it becomes the event
+    # data rather than being copied into another dict.
 
     async def emit_agent_started(self, agent_id: str, **kwargs):
+        kwargs["agent_id"] = agent_id
         await self.publish(Event(
             type=EventType.AGENT_STARTED,
             source=agent_id,
-            data={"agent_id": agent_id, **kwargs},
+            data=kwargs,
         ))
 
     async def emit_agent_stopped(self, agent_id: str, **kwargs):
+        kwargs["agent_id"] = agent_id
         await self.publish(Event(
             type=EventType.AGENT_STOPPED,
             source=agent_id,
-            data={"agent_id": agent_id, **kwargs},
+            data=kwargs,
         ))
 
     async def emit_task_started(self, agent_id: str, task_id: str, capability: str, **kwargs):
+        kwargs["agent_id"] = agent_id
+        kwargs["task_id"] = task_id
+        kwargs["capability"] = capability
         await self.publish(Event(
             type=EventType.TASK_STARTED,
             source=agent_id,
-            data={"agent_id": agent_id, "task_id": task_id, "capability": capability, **kwargs},
+            data=kwargs,
             correlation_id=task_id,
         ))
 
     async def emit_task_completed(self, agent_id: str, task_id: str, result: Any, **kwargs):
+        kwargs["agent_id"] = agent_id
+        kwargs["task_id"] = task_id
+        kwargs["result"] = result
         await self.publish(Event(
             type=EventType.TASK_COMPLETED,
             source=agent_id,
-            data={"agent_id": agent_id, "task_id": task_id, "result": result, **kwargs},
+            data=kwargs,
             correlation_id=task_id,
         ))
 
     async def emit_task_failed(self, agent_id: str, task_id: str, error: str, **kwargs):
+        kwargs["agent_id"] = agent_id
+        kwargs["task_id"] = task_id
+        kwargs["error"] = error
         await self.publish(Event(
             type=EventType.TASK_FAILED,
             source=agent_id,
-            data={"agent_id": agent_id, "task_id": task_id, "error": error, **kwargs},
+            data=kwargs,
             correlation_id=task_id,
         ))
 
     async def emit_workflow_started(self, workflow_id: str, execution_id: str, **kwargs):
+        kwargs["workflow_id"] = workflow_id
+        kwargs["execution_id"] = execution_id
         await self.publish(Event(
             type=EventType.WORKFLOW_STARTED,
             source="workflow-engine",
-            data={"workflow_id": workflow_id, "execution_id": execution_id, **kwargs},
+            data=kwargs,
             correlation_id=execution_id,
         ))
 
     async def emit_workflow_completed(self, workflow_id: str, execution_id: str, **kwargs):
+        kwargs["workflow_id"] = workflow_id
+        kwargs["execution_id"] = execution_id
         await self.publish(Event(
             type=EventType.WORKFLOW_COMPLETED,
             source="workflow-engine",
-            data={"workflow_id": workflow_id, "execution_id": execution_id, **kwargs},
+            data=kwargs,
             correlation_id=execution_id,
         ))
 
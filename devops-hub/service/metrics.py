@@ -4,8 +4,10 @@ Prometheus metrics module for DevOps Hub.
 Provides HTTP request tracking, custom counters, and a /metrics endpoint.
 """
 
+import re
 import time
-from typing import Callable
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
 
 from fastapi import FastAPI, Request, Response
 from fastapi.routing import APIRoute
@@ -82,14 +84,36 @@ WEBSOCKET_CONNECTIONS = Gauge(
 )
 
 
+# ============ Path Normalization Patterns ============
+
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+    re.IGNORECASE,
+)
+_NUMERIC_ID_RE = re.compile(r"/\d+(/|$)")
+_DIGIT_RE = re.compile(r"\d")
+
+
 # ============ Helper Functions ============
 
 def track_request(method: str, path: str, status: int, duration: float) -> None:
     """Track an HTTP request with its metrics."""
     # Normalize path to avoid high cardinality (remove IDs)
     normalized_path = _normalize_path(path)
-    HTTP_REQUEST_COUNT.labels(method=method, path=normalized_path, status=str(status)).inc()
-    HTTP_REQUEST_LATENCY.labels(method=method, path=normalized_path).observe(duration)
+    _request_count_child(method, normalized_path, status).inc()
+    _request_latency_child(method, normalized_path).observe(duration)
+
+
+@lru_cache(maxsize=1024)
+def _request_count_child(method: str, path: str, status: int) -> Counter:
+    """Get the request counter child for a label set, resolving labels once."""
+    return HTTP_REQUEST_COUNT.labels(method=method, path=path, status=str(status))
+
+
+@lru_cache(maxsize=1024)
+def _request_latency_child(method: str, path: str) -> Histogram:
+    """Get the request latency child for a label set, resolving labels once."""
+    return HTTP_REQUEST_LATENCY.labels(method=method, path=path)
 
 
 def track_agent_execution(agent_id: str, capability: str, success: bool) -> None:
@@ -104,9 +128,31 @@ def track_workflow_execution(workflow_id: str, status: str, duration: float) ->
     WORKFLOW_DURATION.labels(workflow_id=workflow_id).observe(duration)
 
 
+# Event bus counts accumulated since the last flush, keyed by (event_type, source)
+_pending_event_counts: Dict[Tuple[str, str], int] = {}
+
+
 def track_event_published(event_type: str, source: str) -> None:
-    """Track an event published to the event bus."""
-    EVENT_BUS_MESSAGES.labels(event_type=event_type, source=source).inc()
+    """
+    Track an event published to the event bus.
+
+    Counts are accumulated locally and applied to the prometheus counter
+    in batches by flush_event_metrics, keeping the publish path lock-free.
+    """
+    key = (event_type, source)
+    _pending_event_counts[key] = _pending_event_counts.get(key, 0) + 1
+
+
+def flush_event_metrics() -> None:
+    """Apply accumulated event bus counts to the prometheus counter."""
+    global _pending_event_counts
+    if not _pending_event_counts:
+        return
+    pending, _pending_event_counts = _pending_event_counts, {}
+    for (event_type, source), count in pending.items():
+        # Label EventType members by their value, not their enum name
+        event_type = getattr(event_type, "value", event_type)
+        EVENT_BUS_MESSAGES.labels(event_type=event_type, source=source).inc(count)
 
 
 def set_active_agents(count: int) -> None:
@@ -124,24 +170,22 @@ def decrement_websocket_connections() -> None:
     WEBSOCKET_CONNECTIONS.dec()
 
 
+@lru_cache(maxsize=8192)
 def _normalize_path(path: str) -> str:
     """
     Normalize URL path to reduce cardinality.
 
     Replaces dynamic segments (UUIDs, IDs) with placeholders.
     """
-    import re
+    # Static routes contain no digits, so there is nothing to replace
+    if not _DIGIT_RE.search(path):
+        return path
 
     # Replace UUIDs
-    path = re.sub(
-        r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
-        "{id}",
-        path,
-        flags=re.IGNORECASE,
-    )
+    path = _UUID_RE.sub("{id}", path)
 
     # Replace numeric IDs in path segments
-    path = re.sub(r"/\d+(/|$)", r"/{id}\1", path)
+    path = _NUMERIC_ID_RE.sub(r"/{id}\1", path)
 
     return path
 
@@ -197,6 +241,7 @@ async def metrics_endpoint() -> Response:
 
     Returns metrics in Prometheus text format.
     """
+    flush_event_metrics()
     return Response(
         content=generate_latest(REGISTRY),
         media_type=CONTENT_TYPE_LATEST,
@@ -5,22 +5,24 @@ Provides:
 - Request ID tracking for distributed tracing
 - Request logging with timing
 - Error handling standardization
+
+Both middlewares are plain ASGI callables (like MetricsMiddleware) rather
+than BaseHTTPMiddleware subclasses, avoiding the extra task and response
+stream BaseHTTPMiddleware sets up per request.
 """
 
 import time
 import logging
 from uuid import uuid4
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
 
-from service.logging_config import set_request_id, clear_request_id, get_request_id
+from service.logging_config import set_request_id, clear_request_id
 
 logger = logging.getLogger(__name__)
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Middleware that assigns a unique request ID to each request.
 
@@ -31,75 +33,113 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     - Available throughout the request lifecycle via context var
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get or generate request ID
-        request_id = request.headers.get("X-Request-ID") or str(uuid4())
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = str(uuid4())
 
         # Set in context for logging
         set_request_id(request_id)
 
         # Store in request state for access in handlers
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
         try:
-            response = await call_next(request)
-            response.headers["X-Request-ID"] = request_id
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
             clear_request_id()
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Middleware that logs request/response details with timing.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        start_time = time.time()
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
 
         # Log request
         logger.info(
-            f"Request started: {request.method} {request.url.path}",
+            "Request started: %s %s",
+            method,
+            path,
             extra={
-                "method": request.method,
-                "path": request.url.path,
-                "query": str(request.query_params),
-                "client_ip": request.client.host if request.client else "unknown",
+                "method": method,
+                "path": path,
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "client_ip": client[0] if client else "unknown",
             }
         )
 
-        try:
-            response = await call_next(request)
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Log response
-            log_level = logging.INFO if response.status_code < 400 else logging.WARNING
-            logger.log(
-                log_level,
-                f"Request completed: {request.method} {request.url.path} -> {response.status_code} ({duration_ms:.2f}ms)",
-                extra={
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
-                    "duration_ms": round(duration_ms, 2),
-                }
-            )
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = (time.perf_counter() - start_time) * 1000
+
+                # Log response
+                log_level = logging.INFO if status_code < 400 else logging.WARNING
+                logger.log(
+                    log_level,
+                    "Request completed: %s %s -> %s (%.2fms)",
+                    method,
+                    path,
+                    status_code,
+                    duration_ms,
+                    extra={
+                        "method": method,
+                        "path": path,
+                        "status_code": status_code,
+                        "duration_ms": round(duration_ms, 2),
+                    }
+                )
+
+                # Add timing header
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message)["X-Response-Time"] = f"{duration_ms:.2f}ms"
+            await send(message)
 
-            # Add timing header
-            response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-            return response
+        try:
+            await self.app(scope, receive, send_wrapper)
 
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             logger.error(
-                f"Request failed: {request.method} {request.url.path} -> {type(e).__name__}: {str(e)}",
+                "Request failed: %s %s -> %s: %s",
+                method,
+                path,
+                type(e).__name__,
+                e,
                 extra={
-                    "method": request.method,
-                    "path": request.url.path,
+                    "method": method,
+                    "path": path,
                     "error": str(e),
                     "error_type": type(e).__name__,
                     "duration_ms": round(duration_ms, 2),
@@ -10,16 +10,33 @@ Implements actual delivery for:
 """
 
 import asyncio
+import hashlib
 import json
+import os
+import random
 import ssl
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from email.policy import compat32
+from functools import lru_cache
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
 from urllib.parse import urlparse
 import logging
 
+from core.integrations import (
+    IntegrationType,
+    CredentialType,
+    Integration,
+    get_integration_repository,
+    get_credential_repository,
+    get_user_settings_repository,
+)
+
 # Use aiohttp for async HTTP if available, fall back to urllib
 try:
     import aiohttp
@@ -29,8 +46,282 @@ except ImportError:
     import urllib.request
     import urllib.error
 
+# Use aiosmtplib for async SMTP if available, fall back to smtplib in a thread pool
+try:
+    import aiosmtplib
+    HAS_AIOSMTPLIB = True
+except ImportError:
+    HAS_AIOSMTPLIB = False
+
+# Use orjson for webhook payload serialization if available, fall back to json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# SMTP errors raised by whichever client is in use
+if HAS_AIOSMTPLIB:
+    _SMTP_AUTH_ERRORS = (smtplib.SMTPAuthenticationError, aiosmtplib.SMTPAuthenticationError)
+    _SMTP_ERRORS = (smtplib.SMTPException, aiosmtplib.SMTPException)
+else:
+    _SMTP_AUTH_ERRORS = (smtplib.SMTPAuthenticationError,)
+    _SMTP_ERRORS = (smtplib.SMTPException,)
+
+# Maximum integrations a single notification is sent to at once
+_MAX_CONCURRENT_DISPATCH = 10
+
+# Seconds a decrypted integration credential is reused before re-reading it
+_CREDENTIAL_CACHE_TTL = 60.0
+
+# Seconds the active integration list is reused before re-reading it
+_INTEGRATIONS_CACHE_TTL = 30.0
+
+# Shared aiohttp session so webhook sends reuse pooled keep-alive connections
+_http_session: Optional["aiohttp.ClientSession"] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+# Closes of sessions left on a finished loop, referenced until they complete
+_stale_session_closes: Set[asyncio.Task] = set()
+
+
+def _close_stale_http_session(session: "aiohttp.ClientSession", loop: asyncio.AbstractEventLoop) -> None:
+    """Close a session bound to an event loop other than the running one."""
+    if session.closed:
+        return
+    if loop.is_closed():
+        # Nothing can run on the old loop any more, so aiohttp only marks the
+        # connector closed (its sockets are freed with it), which the
+        # running loop can do
+        task = asyncio.get_running_loop().create_task(session.close())
+        _stale_session_closes.add(task)
+        task.add_done_callback(_stale_session_closes.discard)
+    else:
+        # Let the old loop close its own connections
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+
+def get_http_session() -> "aiohttp.ClientSession":
+    """
+    Get the shared aiohttp session, creating it on first use.
+
+    The session is bound to the running event loop and is recreated if it
+    has been closed or the loop has changed; a session left on a previous
+    loop is closed first.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        if _http_session is not None and _http_session_loop is not loop:
+            _close_stale_http_session(_http_session, _http_session_loop)
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300),
+        )
+        _http_session_loop = loop
+    return _http_session
+
+
+async def close_http_session() -> None:
+    """
+    Close the shared aiohttp session.
+
+    Should be called during application shutdown.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is not None:
+        if _http_session_loop is loop:
+            await _http_session.close()
+        else:
+            _close_stale_http_session(_http_session, _http_session_loop)
+    # Finish closes started on this loop before it shuts down
+    pending = [task for task in _stale_session_closes if task.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending)
+    _http_session = None
+    _http_session_loop = None
+
+
+@dataclass(slots=True)
+class SendResult:
+    """Outcome of a single webhook request."""
+    success: bool
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    response: Optional[str] = None
+    # Transient failure (timeout, connection error, 5xx, 429) worth retrying
+    retryable: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the result dict returned by the public send functions."""
+        result: Dict[str, Any] = {"success": self.success}
+        if self.status_code is not None:
+            result["status_code"] = self.status_code
+        if self.success:
+            result["response"] = self.response
+        else:
+            result["error"] = self.error
+        return result
+
+
+# UTC timestamp string for the current second, reused within that second
+_now_iso_cache = [-1, ""]
+
+
+def _now_iso() -> str:
+    """Get the current UTC time as an ISO 8601 string with second precision."""
+    second = int(time.time())
+    if second != _now_iso_cache[0]:
+        _now_iso_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        _now_iso_cache[0] = second
+    return _now_iso_cache[1]
+
+
+# URL prefixes of genuine Slack incoming webhooks
+_SLACK_WEBHOOK_PREFIXES = ("https://hooks.slack.com/",)
+
+# Headers sent with every webhook request
+_BASE_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "User-Agent": "DevOps-Hub/1.0",
+})
+
+# Constant parts of the Teams Office 365 Connector Card
+_TEAMS_CARD_TEMPLATE = MappingProxyType({
+    "@type": "MessageCard",
+    "@context": "http://schema.org/extensions",
+})
+_TEAMS_SECTION_TEMPLATE = MappingProxyType({
+    "markdown": True,
+})
+
+# Limits on webhook requests in flight, overall and per host
+_WEBHOOK_MAX_CONCURRENCY = int(os.environ.get("NOTIF_MAX_CONCURRENCY", "20"))
+_WEBHOOK_MAX_PER_HOST = 4
+
+_webhook_semaphore: Optional[asyncio.Semaphore] = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _webhook_semaphores(host: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+    """Get the (per-host, global) semaphores bounding webhook requests on the running loop."""
+    global _webhook_semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore_loop is not loop:
+        _webhook_semaphore = asyncio.Semaphore(_WEBHOOK_MAX_CONCURRENCY)
+        _host_semaphores.clear()
+        _semaphore_loop = loop
+
+    host_semaphore = _host_semaphores.get(host)
+    if host_semaphore is None:
+        host_semaphore = _host_semaphores[host] = asyncio.Semaphore(_WEBHOOK_MAX_PER_HOST)
+    return host_semaphore, _webhook_semaphore
+
+
+# Retries for transient webhook failures: attempt n (from 1) waits a random
+# delay of up to min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2**n) seconds
+_WEBHOOK_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+
+# Rate limiting signalled by webhook hosts (429 Retry-After, or an exhausted
+# X-RateLimit-Remaining): requests to the host wait until the given time
+_host_blocked_until: Dict[str, float] = {}
+_DEFAULT_RETRY_AFTER = 1.0
+_MAX_RATE_LIMIT_WAIT = 60.0
+
+
+def _note_rate_limit(host: str, status: int, headers: Any) -> None:
+    """Record how long requests to host should wait, based on a response's rate-limit headers."""
+    if status == 429:
+        wait = headers.get("Retry-After")
+    elif headers.get("X-RateLimit-Remaining") == "0":
+        # Discord sends the bucket reset delay; Slack only sends Retry-After on 429
+        wait = headers.get("X-RateLimit-Reset-After")
+        if wait is None:
+            return
+    else:
+        return
+
+    try:
+        delay = float(wait)
+    except (TypeError, ValueError):
+        delay = _DEFAULT_RETRY_AFTER
+    delay = min(max(delay, 0.0), _MAX_RATE_LIMIT_WAIT)
+
+    blocked_until = time.monotonic() + delay
+    if blocked_until > _host_blocked_until.get(host, 0.0):
+        _host_blocked_until[host] = blocked_until
+        if status == 429:
+            logger.warning("Rate limited by %s, pausing requests for %.1fs", host, delay)
+
+
+# Per-host circuit breaker: after this many consecutive failures, sends to the
+# host are short-circuited for the cooldown, then a single probe is let through.
+# A probe with no recorded outcome after the probe timeout re-opens the circuit.
+_BREAKER_FAILURE_THRESHOLD = 5
+_BREAKER_COOLDOWN_SECONDS = 60.0
+_BREAKER_PROBE_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass(slots=True)
+class _CircuitState:
+    """Circuit breaker state for one webhook host."""
+    state: str = "closed"  # closed, open or half_open
+    failures: int = 0
+    opened_at: float = 0.0
+    probe_started_at: float = 0.0
+
+
+_breaker_state: Dict[str, _CircuitState] = {}
+
+
+def _breaker_allows(host: str) -> bool:
+    """Check whether a request to host may be sent, moving open circuits to half-open after the cooldown."""
+    circuit = _breaker_state.get(host)
+    if circuit is None or circuit.state == "closed":
+        return True
+    now = time.monotonic()
+    if circuit.state == "open" and now - circuit.opened_at >= _BREAKER_COOLDOWN_SECONDS:
+        # Let this request through as the probe; others wait for its outcome
+        circuit.state = "half_open"
+        circuit.probe_started_at = now
+        return True
+    if circuit.state == "half_open" and now - circuit.probe_started_at >= _BREAKER_PROBE_TIMEOUT_SECONDS:
+        # The probe's outcome was never recorded; start another cooldown
+        logger.warning("Circuit probe for %s timed out, reopening", host)
+        circuit.state = "open"
+        circuit.opened_at = now
+    return False
+
+
+def _breaker_record(host: str, result: Optional[SendResult]) -> None:
+    """Record a send result against host's circuit; None means the send didn't complete."""
+    if result is None:
+        failed = True
+    else:
+        status_code = result.status_code
+        # Timeouts, connection errors and 5xx count against the host; 4xx mean it is up
+        failed = not result.success and (status_code is None or status_code >= 500)
+    circuit = _breaker_state.get(host)
+    if not failed:
+        if circuit is not None:
+            circuit.state = "closed"
+            circuit.failures = 0
+        return
+
+    if circuit is None:
+        circuit = _breaker_state[host] = _CircuitState()
+    circuit.failures += 1
+    if circuit.state == "half_open" or circuit.failures >= _BREAKER_FAILURE_THRESHOLD:
+        if circuit.state != "open":
+            logger.warning("Circuit opened for %s after %s failures", host, circuit.failures)
+        circuit.state = "open"
+        circuit.opened_at = time.monotonic()
+
 
 async def send_slack_message(
     webhook_url: str,
@@ -59,8 +350,8 @@ async def send_slack_message(
     if not webhook_url:
         return {"success": False, "error": "No webhook URL provided"}
 
-    if not webhook_url.startswith("https://hooks.slack.com/"):
-        logger.warning(f"Slack webhook URL doesn't look valid: {webhook_url[:50]}...")
+    if not webhook_url.startswith(_SLACK_WEBHOOK_PREFIXES):
+        logger.warning("Slack webhook URL doesn't look valid: %s...", webhook_url[:50])
 
     payload = {
         "text": message,
@@ -101,14 +392,13 @@ async def send_teams_message(
 
     # Teams uses Office 365 Connector Card format
     payload = {
-        "@type": "MessageCard",
-        "@context": "http://schema.org/extensions",
+        **_TEAMS_CARD_TEMPLATE,
         "themeColor": theme_color,
         "summary": title,
         "sections": [{
             "activityTitle": title,
             "facts": [],
-            "markdown": True,
+            **_TEAMS_SECTION_TEMPLATE,
             "text": message,
         }],
     }
@@ -213,40 +503,40 @@ async def send_email(
 
     try:
         # Create message
-        if html_body:
-            msg = MIMEMultipart("alternative")
-            msg.attach(MIMEText(body, "plain"))
-            msg.attach(MIMEText(html_body, "html"))
-        else:
-            msg = MIMEText(body, "plain")
-
-        msg["Subject"] = subject
-        msg["From"] = f"{from_name} <{from_address}>" if from_name else from_address
-        msg["To"] = ", ".join(to_addresses)
+        msg = _build_email(subject, body, html_body, from_address, from_name, ", ".join(to_addresses))
 
         # Send via SMTP
-        # Run in thread pool to not block async loop
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            _send_smtp_sync,
-            smtp_host,
-            smtp_port,
-            username,
-            password,
-            from_address,
-            to_addresses,
-            msg,
-            use_tls,
-        )
+        if HAS_AIOSMTPLIB:
+            await _send_smtp_async(
+                smtp_host,
+                smtp_port,
+                username,
+                password,
+                from_address,
+                [(to_addresses, msg)],
+                use_tls,
+            )
+        else:
+            # Run in thread pool to not block async loop
+            await asyncio.to_thread(
+                _send_smtp_sync,
+                smtp_host,
+                smtp_port,
+                username,
+                password,
+                from_address,
+                to_addresses,
+                msg,
+                use_tls,
+            )
 
         logger.info(f"Email sent to {len(to_addresses)} recipients")
         return {"success": True, "recipients": len(to_addresses)}
 
-    except smtplib.SMTPAuthenticationError as e:
+    except _SMTP_AUTH_ERRORS as e:
         logger.error(f"SMTP authentication failed: {e}")
         return {"success": False, "error": "SMTP authentication failed"}
-    except smtplib.SMTPException as e:
+    except _SMTP_ERRORS as e:
         logger.error(f"SMTP error: {e}")
         return {"success": False, "error": f"SMTP error: {str(e)}"}
     except Exception as e:
@@ -254,6 +544,166 @@ async def send_email(
         return {"success": False, "error": str(e)}
 
 
+async def send_email_bulk(
+    smtp_host: str,
+    smtp_port: int,
+    username: str,
+    password: str,
+    from_address: str,
+    messages: List[Tuple[str, str, List[str]]],
+    use_tls: bool = True,
+    from_name: Optional[str] = "DevOps Hub",
+) -> Dict[str, Any]:
+    """
+    Send several emails via SMTP over a single connection.
+
+    Messages with the same subject and body are coalesced into one send to
+    the union of their recipients, addressed to undisclosed recipients.
+
+    Args:
+        smtp_host: SMTP server hostname
+        smtp_port: SMTP server port
+        username: SMTP username
+        password: SMTP password
+        from_address: Sender email address
+        messages: List of (subject, plain text body, recipient addresses)
+        use_tls: Whether to use TLS
+        from_name: Sender display name
+
+    Returns:
+        Dict with success status, message and recipient counts, and any error message
+    """
+    # Group recipients by message content, keeping first-seen order
+    groups: Dict[Tuple[str, str], List[Dict[str, None]]] = {}
+    for subject, body, to_addrs in messages:
+        if to_addrs:
+            groups.setdefault((subject, body), []).append(dict.fromkeys(to_addrs))
+
+    if not smtp_host or not groups:
+        return {"success": False, "error": "Missing SMTP host or recipients"}
+
+    envelopes = []
+    recipient_count = 0
+    for (subject, body), recipient_sets in groups.items():
+        recipients = recipient_sets[0]
+        for other in recipient_sets[1:]:
+            recipients.update(other)
+        to_addrs = list(recipients)
+        to_header = ", ".join(to_addrs) if len(recipient_sets) == 1 else "undisclosed-recipients:;"
+        envelopes.append((to_addrs, _build_email(subject, body, None, from_address, from_name, to_header)))
+        recipient_count += len(to_addrs)
+
+    try:
+        if HAS_AIOSMTPLIB:
+            await _send_smtp_async(
+                smtp_host, smtp_port, username, password, from_address, envelopes, use_tls
+            )
+        else:
+            # Run the whole batch in one thread pool call
+            await asyncio.to_thread(
+                _send_smtp_batch_sync,
+                smtp_host,
+                smtp_port,
+                username,
+                password,
+                from_address,
+                envelopes,
+                use_tls,
+            )
+
+        logger.info(f"Sent {len(envelopes)} emails to {recipient_count} recipients")
+        return {"success": True, "messages": len(envelopes), "recipients": recipient_count}
+
+    except _SMTP_AUTH_ERRORS as e:
+        logger.error(f"SMTP authentication failed: {e}")
+        return {"success": False, "error": "SMTP authentication failed"}
+    except _SMTP_ERRORS as e:
+        logger.error(f"SMTP error: {e}")
+        return {"success": False, "error": f"SMTP error: {str(e)}"}
+    except Exception as e:
+        logger.error(f"Bulk email send failed: {e}")
+        return {"success": False, "error": str(e)}
+
+
+def _build_email(
+    subject: str,
+    body: str,
+    html_body: Optional[str],
+    from_address: str,
+    from_name: Optional[str],
+    to_header: str,
+) -> str:
+    """
+    Build a plain text, or plain text and HTML, email message as a string.
+
+    Everything but the To header comes from a cache, so the same
+    notification sent to several recipient lists is only serialized once.
+    """
+    from_header = f"{from_name} <{from_address}>" if from_name else from_address
+    return compat32.fold("To", to_header) + _serialize_email(subject, body, html_body, from_header)
+
+
+@lru_cache(maxsize=64)
+def _serialize_email(subject: str, body: str, html_body: Optional[str], from_header: str) -> str:
+    """Serialize an email message without its To header."""
+    if html_body:
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(body, "plain"))
+        msg.attach(MIMEText(html_body, "html"))
+    else:
+        msg = MIMEText(body, "plain")
+
+    msg["Subject"] = subject
+    msg["From"] = from_header
+    return msg.as_string()
+
+
+# Pooled SMTP connections keyed by (host, port, username, password hash,
+# use_tls), so repeated emails skip the TLS handshake and login
+_smtp_pool: Dict[Tuple[str, int, str, str, bool], smtplib.SMTP] = {}
+_smtp_locks: Dict[Tuple[str, int, str, str, bool], threading.Lock] = {}
+_smtp_locks_guard = threading.Lock()
+
+
+def _smtp_pool_key(host: str, port: int, username: str, password: str, use_tls: bool) -> Tuple[str, int, str, str, bool]:
+    """Pool key for an SMTP account; holds a hash of the password, never the password itself."""
+    password_hash = hashlib.sha256(password.encode("utf-8")).hexdigest() if password else ""
+    return (host, port, username, password_hash, use_tls)
+
+
+def _smtp_connect(host: str, port: int, username: str, password: str, use_tls: bool) -> smtplib.SMTP:
+    """Open and authenticate an SMTP connection."""
+    context = ssl.create_default_context()
+
+    if use_tls:
+        server = smtplib.SMTP(host, port)
+        try:
+            server.starttls(context=context)
+        except Exception:
+            server.close()
+            raise
+    else:
+        server = smtplib.SMTP_SSL(host, port, context=context)
+
+    if username and password:
+        try:
+            server.login(username, password)
+        except Exception:
+            server.close()
+            raise
+    return server
+
+
+def _discard_smtp(key: Tuple[str, int, str, str, bool]) -> None:
+    """Drop a pooled SMTP connection, closing it quietly."""
+    server = _smtp_pool.pop(key, None)
+    if server is not None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+
 def _send_smtp_sync(
     host: str,
     port: int,
@@ -261,23 +711,142 @@ def _send_smtp_sync(
     password: str,
     from_addr: str,
     to_addrs: List[str],
-    msg: MIMEText,
+    msg: str,
     use_tls: bool,
 ):
-    """Synchronous SMTP send for use in thread pool."""
-    context = ssl.create_default_context()
+    """Synchronous SMTP send for use in thread pool, over a pooled connection."""
+    _send_smtp_batch_sync(host, port, username, password, from_addr, [(to_addrs, msg)], use_tls)
 
-    if use_tls:
-        with smtplib.SMTP(host, port) as server:
-            server.starttls(context=context)
-            if username and password:
-                server.login(username, password)
-            server.sendmail(from_addr, to_addrs, msg.as_string())
-    else:
-        with smtplib.SMTP_SSL(host, port, context=context) as server:
-            if username and password:
-                server.login(username, password)
-            server.sendmail(from_addr, to_addrs, msg.as_string())
+
+def _send_smtp_batch_sync(
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    from_addr: str,
+    envelopes: List[Tuple[List[str], str]],
+    use_tls: bool,
+):
+    """Synchronously send (recipients, message) envelopes over one pooled connection."""
+    key = _smtp_pool_key(host, port, username, password, use_tls)
+    with _smtp_locks_guard:
+        lock = _smtp_locks.setdefault(key, threading.Lock())
+
+    # One send at a time per connection
+    with lock:
+        server = _smtp_pool.get(key)
+        if server is not None:
+            # Check the pooled connection is still alive before reusing it
+            try:
+                server.noop()
+            except (smtplib.SMTPException, OSError):
+                _discard_smtp(key)
+                server = None
+
+        if server is None:
+            server = _smtp_connect(host, port, username, password, use_tls)
+            _smtp_pool[key] = server
+
+        try:
+            for to_addrs, msg in envelopes:
+                server.sendmail(from_addr, to_addrs, msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            _discard_smtp(key)
+            raise
+
+
+# Pooled aiosmtplib connections, bound to the event loop that opened them
+_async_smtp_pool: Dict[Tuple[str, int, str, str, bool], "aiosmtplib.SMTP"] = {}
+_async_smtp_locks: Dict[Tuple[str, int, str, str, bool], asyncio.Lock] = {}
+_async_smtp_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def _send_smtp_async(
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    from_addr: str,
+    envelopes: List[Tuple[List[str], str]],
+    use_tls: bool,
+):
+    """Send (recipients, message) envelopes over a pooled aiosmtplib connection."""
+    global _async_smtp_loop
+    loop = asyncio.get_running_loop()
+    if _async_smtp_loop is not loop:
+        # Connections from another event loop can't be used here
+        _close_async_smtp_pool()
+        _async_smtp_locks.clear()
+        _async_smtp_loop = loop
+
+    key = _smtp_pool_key(host, port, username, password, use_tls)
+    lock = _async_smtp_locks.get(key)
+    if lock is None:
+        lock = _async_smtp_locks[key] = asyncio.Lock()
+
+    # One send at a time per connection
+    async with lock:
+        server = _async_smtp_pool.get(key)
+        if server is not None:
+            # Check the pooled connection is still alive before reusing it
+            try:
+                await server.noop()
+            except (aiosmtplib.SMTPException, OSError):
+                _async_smtp_pool.pop(key, None)
+                server.close()
+                server = None
+
+        if server is None:
+            server = aiosmtplib.SMTP(
+                hostname=host,
+                port=port,
+                use_tls=not use_tls,
+                start_tls=use_tls,
+                tls_context=ssl.create_default_context(),
+            )
+            await server.connect()
+            try:
+                if username and password:
+                    await server.login(username, password)
+            except Exception:
+                server.close()
+                raise
+            _async_smtp_pool[key] = server
+
+        try:
+            for to_addrs, msg in envelopes:
+                await server.sendmail(from_addr, to_addrs, msg)
+        except OSError:
+            # Includes SMTPServerDisconnected
+            _async_smtp_pool.pop(key, None)
+            server.close()
+            raise
+
+
+def _close_async_smtp_pool() -> None:
+    """Close and drop every pooled aiosmtplib connection."""
+    for server in _async_smtp_pool.values():
+        try:
+            server.close()
+        except Exception:
+            # The connection's event loop may already be closed; drop the socket directly
+            transport = getattr(server, "transport", None)
+            if transport is not None:
+                transport.abort()
+    _async_smtp_pool.clear()
+
+
+def close_smtp_connections() -> None:
+    """
+    Close all pooled SMTP connections.
+
+    Should be called during application shutdown.
+    """
+    for key in list(_smtp_pool):
+        with _smtp_locks[key]:
+            _discard_smtp(key)
+
+    _close_async_smtp_pool()
 
 
 async def _send_http_post(
@@ -289,122 +858,226 @@ async def _send_http_post(
     """
     Send an HTTP POST request with JSON payload.
 
-    Uses aiohttp if available, falls back to urllib.
-    """
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "DevOps-Hub/1.0",
-    }
-    if extra_headers:
-        headers.update(extra_headers)
+    Uses aiohttp if available, falls back to urllib. Requests to a host
+    whose circuit is open fail immediately without being sent, and requests
+    to a host that has rate limited us wait until its limit resets.
 
-    json_data = json.dumps(payload).encode("utf-8")
+    Retryable failures are retried with exponential backoff and full jitter,
+    up to _WEBHOOK_MAX_ATTEMPTS tries. Each attempt holds the concurrency
+    slots only around the request itself, never while waiting.
+    """
+    headers = {**_BASE_HEADERS, **extra_headers} if extra_headers else _BASE_HEADERS
 
-    if HAS_AIOHTTP:
-        return await _send_with_aiohttp(url, json_data, headers, service_name)
+    if HAS_ORJSON:
+        json_data = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
     else:
-        return await _send_with_urllib(url, json_data, headers, service_name)
+        json_data = json.dumps(payload).encode("utf-8")
+
+    host = urlparse(url).netloc
+    if not _breaker_allows(host):
+        return {"success": False, "error": "circuit open"}
+
+    # Always record an outcome, so a cancelled or failed half-open probe
+    # can't leave the circuit waiting on it
+    result = None
+    try:
+        host_semaphore, global_semaphore = _webhook_semaphores(host)
+        for attempt in range(_WEBHOOK_MAX_ATTEMPTS):
+            # Never send before a rate limit from the host has reset
+            delay = _host_blocked_until.get(host, 0.0) - time.monotonic()
+            if attempt:
+                delay = max(delay, random.uniform(0, min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** attempt)))
+                logger.info("%s request failed, retrying in %.2fs", service_name, delay)
+            if delay > 0:
+                # Wait holding no slot, so one slow host can't starve sends to the others
+                await asyncio.sleep(delay)
+
+            # Take the host slot first so waiting on a busy host doesn't hold a global one
+            async with host_semaphore:
+                async with global_semaphore:
+                    if HAS_AIOHTTP:
+                        result = await _send_with_aiohttp(url, json_data, headers, service_name, host)
+                    else:
+                        result = await _send_with_urllib(url, json_data, headers, service_name, host)
+            if not result.retryable:
+                break
+    finally:
+        _breaker_record(host, result)
+    return result.to_dict()
+
+
+# Response bytes read from webhook hosts; only a preview is kept in results
+_RESPONSE_READ_LIMIT = 1024
+
+
+async def _read_response_text(response: "aiohttp.ClientResponse") -> str:
+    """Read and decode at most _RESPONSE_READ_LIMIT bytes of a response body."""
+    raw = b""
+    while len(raw) < _RESPONSE_READ_LIMIT:
+        chunk = await response.content.read(_RESPONSE_READ_LIMIT - len(raw))
+        if not chunk:
+            break
+        raw += chunk
+    return raw.decode(response.charset or "utf-8", errors="replace")
 
 
 async def _send_with_aiohttp(
     url: str,
     data: bytes,
-    headers: Dict[str, str],
+    headers: Mapping[str, str],
     service_name: str,
-) -> Dict[str, Any]:
-    """Send request using aiohttp."""
+    host: str,
+) -> SendResult:
+    """
+    Send a single request using aiohttp.
+
+    Timeouts, connection errors, 5xx and 429 responses are marked retryable.
+    """
+    session = get_http_session()
+
     try:
-        timeout = aiohttp.ClientTimeout(total=30)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, data=data, headers=headers) as response:
-                response_text = await response.text()
-
-                if response.status in (200, 201, 202, 204):
-                    logger.info(f"{service_name} notification sent successfully")
-                    return {
-                        "success": True,
-                        "status_code": response.status,
-                        "response": response_text[:500] if response_text else None,
-                    }
-                else:
-                    logger.warning(f"{service_name} returned status {response.status}: {response_text[:200]}")
-                    return {
-                        "success": False,
-                        "status_code": response.status,
-                        "error": f"HTTP {response.status}: {response_text[:200]}",
-                    }
+        async with session.post(url, data=data, headers=headers) as response:
+            response_text = await _read_response_text(response)
+            _note_rate_limit(host, response.status, response.headers)
+
+            if response.status in (200, 201, 202, 204):
+                logger.info("%s notification sent successfully", service_name)
+                return SendResult(
+                    success=True,
+                    status_code=response.status,
+                    response=response_text[:500] if response_text else None,
+                )
+            else:
+                logger.warning("%s returned status %s: %s", service_name, response.status, response_text[:200])
+                return SendResult(
+                    success=False,
+                    status_code=response.status,
+                    error=f"HTTP {response.status}: {response_text[:200]}",
+                    retryable=response.status >= 500 or response.status == 429,
+                )
 
     except asyncio.TimeoutError:
-        logger.error(f"{service_name} request timed out")
-        return {"success": False, "error": "Request timed out"}
+        logger.error("%s request timed out", service_name)
+        return SendResult(success=False, error="Request timed out", retryable=True)
+    except aiohttp.ClientConnectionError as e:
+        logger.error("%s request failed: %s", service_name, e)
+        return SendResult(success=False, error=str(e), retryable=True)
     except aiohttp.ClientError as e:
-        logger.error(f"{service_name} request failed: {e}")
-        return {"success": False, "error": str(e)}
+        logger.error("%s request failed: %s", service_name, e)
+        return SendResult(success=False, error=str(e))
     except Exception as e:
-        logger.error(f"{service_name} unexpected error: {e}")
-        return {"success": False, "error": str(e)}
+        logger.error("%s unexpected error: %s", service_name, e)
+        return SendResult(success=False, error=str(e))
 
 
 async def _send_with_urllib(
     url: str,
     data: bytes,
-    headers: Dict[str, str],
+    headers: Mapping[str, str],
     service_name: str,
-) -> Dict[str, Any]:
+    host: str,
+) -> SendResult:
     """Send request using urllib (fallback)."""
-    loop = asyncio.get_event_loop()
-
     def _do_request():
         req = urllib.request.Request(url, data=data, headers=headers, method="POST")
         try:
             with urllib.request.urlopen(req, timeout=30) as response:
-                return response.status, response.read().decode("utf-8", errors="replace")
+                return response.status, response.headers, response.read(_RESPONSE_READ_LIMIT)
         except urllib.error.HTTPError as e:
-            return e.code, e.read().decode("utf-8", errors="replace")
+            return e.code, e.headers, e.read(_RESPONSE_READ_LIMIT)
 
     try:
-        status, response_text = await loop.run_in_executor(None, _do_request)
+        status, response_headers, raw = await asyncio.to_thread(_do_request)
+        response_text = raw.decode(response_headers.get_content_charset() or "utf-8", errors="replace")
+        _note_rate_limit(host, status, response_headers)
 
         if status in (200, 201, 202, 204):
-            logger.info(f"{service_name} notification sent successfully")
-            return {
-                "success": True,
-                "status_code": status,
-                "response": response_text[:500] if response_text else None,
-            }
+            logger.info("%s notification sent successfully", service_name)
+            return SendResult(
+                success=True,
+                status_code=status,
+                response=response_text[:500] if response_text else None,
+            )
         else:
-            logger.warning(f"{service_name} returned status {status}: {response_text[:200]}")
-            return {
-                "success": False,
-                "status_code": status,
-                "error": f"HTTP {status}: {response_text[:200]}",
-            }
+            logger.warning("%s returned status %s: %s", service_name, status, response_text[:200])
+            return SendResult(
+                success=False,
+                status_code=status,
+                error=f"HTTP {status}: {response_text[:200]}",
+            )
 
     except urllib.error.URLError as e:
-        logger.error(f"{service_name} request failed: {e}")
-        return {"success": False, "error": str(e)}
+        logger.error("%s request failed: %s", service_name, e)
+        return SendResult(success=False, error=str(e))
     except Exception as e:
-        logger.error(f"{service_name} unexpected error: {e}")
-        return {"success": False, "error": str(e)}
+        logger.error("%s unexpected error: %s", service_name, e)
+        return SendResult(success=False, error=str(e))
 
 
 class NotificationManager:
     """
     High-level notification manager that routes notifications
     based on user preferences and configured integrations.
+
+    Webhook sends share the module's pooled aiohttp session; call aclose()
+    at shutdown to release its connections.
     """
 
     def __init__(self):
-        from core.integrations import (
-            get_integration_repository,
-            get_credential_repository,
-            get_user_settings_repository,
-            IntegrationType,
-            CredentialType,
-        )
         self.int_repo = get_integration_repository()
         self.cred_repo = get_credential_repository()
         self.settings_repo = get_user_settings_repository()
+        # (integration_id, credential_type) -> (value, expires_at)
+        self._cred_cache: Dict[Tuple[str, CredentialType], Tuple[Optional[str], float]] = {}
+        # Snapshot of active integrations and when it must be refreshed
+        self._integrations_cache: Tuple[Integration, ...] = ()
+        self._integrations_exp = 0.0
+        # Integration type -> sender, each taking
+        # (integration, webhook_url, event_type, title, message, data)
+        self._dispatchers: Dict[IntegrationType, Callable[..., Awaitable[Dict[str, Any]]]] = {
+            IntegrationType.SLACK: self._send_slack,
+            IntegrationType.TEAMS: self._send_teams,
+            IntegrationType.DISCORD: self._send_discord,
+            IntegrationType.WEBHOOK: self._send_webhook,
+        }
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session used for webhook sends."""
+        if HAS_AIOHTTP:
+            await close_http_session()
+
+    def _get_cred(
+        self,
+        integration_id: str,
+        credential_type: CredentialType,
+        ttl: float = _CREDENTIAL_CACHE_TTL,
+    ) -> Optional[str]:
+        """Get a decrypted credential, reusing it for ttl seconds."""
+        key = (integration_id, credential_type)
+        now = time.monotonic()
+        cached = self._cred_cache.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        value = self.cred_repo.retrieve(integration_id, credential_type)
+        self._cred_cache[key] = (value, now + ttl)
+        return value
+
+    def _active_integrations(self) -> Tuple[Integration, ...]:
+        """Get the active integrations, refreshing the snapshot once it expires."""
+        now = time.monotonic()
+        if now > self._integrations_exp:
+            self._integrations_cache = tuple(self.int_repo.list_all_active())
+            self._integrations_exp = now + _INTEGRATIONS_CACHE_TTL
+        return self._integrations_cache
+
+    def invalidate_integrations(self) -> None:
+        """Force the active integrations to be re-read on the next notification."""
+        self._integrations_exp = 0.0
+
+    def invalidate_credentials(self, integration_id: str) -> None:
+        """Drop cached credentials for an integration after they change."""
+        for key in [k for k in self._cred_cache if k[0] == integration_id]:
+            del self._cred_cache[key]
 
     async def send_notification(
         self,
@@ -427,8 +1100,6 @@ class NotificationManager:
         Returns:
             Dict with results from each channel
         """
-        from core.integrations import IntegrationType, CredentialType
-
         # Get user preferences
         prefs = self.settings_repo.get_notification_preferences(api_key_id or "__default__")
 
@@ -443,86 +1114,153 @@ class NotificationManager:
         channels = prefs.get("channels", {})
 
         # Get all active integrations
-        integrations = self.int_repo.list_all_active()
+        integrations = self._active_integrations()
+
+        # Send to every enabled channel concurrently, so a slow webhook
+        # doesn't hold up the others
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_DISPATCH)
+        dispatchers = self._dispatchers
+        sent_payloads: Dict[Tuple[IntegrationType, str, str], str] = {}
+        sends = [
+            self._dispatch(
+                semaphore, sent_payloads, dispatchers[integration.type],
+                integration, event_type, title, message, data,
+            )
+            for integration in integrations
+            # Check if channel is enabled in preferences and can be sent to
+            if channels.get(integration.type.value, False) and integration.type in dispatchers
+        ]
+        for outcome in await asyncio.gather(*sends, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Notification dispatch failed: {outcome}")
+            elif outcome is not None:
+                key, result = outcome
+                results[key] = result
 
-        for integration in integrations:
-            channel_name = integration.type.value
+        return results
+
+    async def _dispatch(
+        self,
+        semaphore: asyncio.Semaphore,
+        sent_payloads: Dict[Tuple[IntegrationType, str, str], str],
+        sender: Callable[..., Awaitable[Dict[str, Any]]],
+        integration: Integration,
+        event_type: str,
+        title: str,
+        message: str,
+        data: Optional[Dict[str, Any]],
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Send a notification to a single integration.
 
-            # Check if channel is enabled in preferences
-            if not channels.get(channel_name, False):
-                continue
+        Integrations of the same type with the same webhook URL and config
+        would receive an identical payload, so only the first one in
+        sent_payloads is sent; the others are recorded as skipped.
 
+        Returns:
+            (result key, result) tuple, or None if nothing was sent
+        """
+        key = f"{integration.type.value}_{integration.name}"
+
+        async with semaphore:
             try:
-                if integration.type == IntegrationType.SLACK:
-                    webhook_url = self.cred_repo.retrieve(integration.id, CredentialType.WEBHOOK_URL)
-                    if webhook_url:
-                        result = await send_slack_message(
-                            webhook_url=webhook_url,
-                            message=f"*{title}*\n{message}",
-                            channel=integration.config.get("default_channel"),
-                            username=integration.config.get("bot_name", "DevOps Hub"),
-                            icon_emoji=integration.config.get("icon_emoji", ":robot_face:"),
-                        )
-                        results[f"slack_{integration.name}"] = result
-                        self.int_repo.update_last_used(
-                            integration.id,
-                            error=None if result["success"] else result.get("error")
-                        )
-
-                elif integration.type == IntegrationType.TEAMS:
-                    webhook_url = self.cred_repo.retrieve(integration.id, CredentialType.WEBHOOK_URL)
-                    if webhook_url:
-                        result = await send_teams_message(
-                            webhook_url=webhook_url,
-                            message=message,
-                            title=title,
-                        )
-                        results[f"teams_{integration.name}"] = result
-                        self.int_repo.update_last_used(
-                            integration.id,
-                            error=None if result["success"] else result.get("error")
-                        )
-
-                elif integration.type == IntegrationType.DISCORD:
-                    webhook_url = self.cred_repo.retrieve(integration.id, CredentialType.WEBHOOK_URL)
-                    if webhook_url:
-                        result = await send_discord_message(
-                            webhook_url=webhook_url,
-                            message=f"**{title}**\n{message}",
-                        )
-                        results[f"discord_{integration.name}"] = result
-                        self.int_repo.update_last_used(
-                            integration.id,
-                            error=None if result["success"] else result.get("error")
-                        )
-
-                elif integration.type == IntegrationType.WEBHOOK:
-                    webhook_url = self.cred_repo.retrieve(integration.id, CredentialType.WEBHOOK_URL)
-                    if webhook_url:
-                        result = await send_webhook(
-                            url=webhook_url,
-                            payload={
-                                "event": event_type,
-                                "title": title,
-                                "message": message,
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "data": data or {},
-                            },
-                        )
-                        results[f"webhook_{integration.name}"] = result
-                        self.int_repo.update_last_used(
-                            integration.id,
-                            error=None if result["success"] else result.get("error")
-                        )
+                webhook_url = self._get_cred(integration.id, CredentialType.WEBHOOK_URL)
+                if not webhook_url:
+                    return None
+
+                payload_key = (
+                    integration.type,
+                    webhook_url,
+                    json.dumps(integration.config, sort_keys=True, default=str),
+                )
+                original = sent_payloads.get(payload_key)
+                if original is not None:
+                    return key, {"skipped": True, "reason": f"duplicate of {original}"}
+                sent_payloads[payload_key] = key
+
+                result = await sender(integration, webhook_url, event_type, title, message, data)
+                self.int_repo.update_last_used(
+                    integration.id,
+                    error=None if result["success"] else result.get("error")
+                )
+                return key, result
 
             except Exception as e:
                 logger.error(f"Failed to send to {integration.name}: {e}")
-                results[f"{channel_name}_{integration.name}"] = {
+                return key, {
                     "success": False,
                     "error": str(e),
                 }
 
-        return results
+    async def _send_slack(
+        self,
+        integration: Integration,
+        webhook_url: str,
+        event_type: str,
+        title: str,
+        message: str,
+        data: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Send a notification to a Slack integration."""
+        return await send_slack_message(
+            webhook_url=webhook_url,
+            message=f"*{title}*\n{message}",
+            channel=integration.config.get("default_channel"),
+            username=integration.config.get("bot_name", "DevOps Hub"),
+            icon_emoji=integration.config.get("icon_emoji", ":robot_face:"),
+        )
+
+    async def _send_teams(
+        self,
+        integration: Integration,
+        webhook_url: str,
+        event_type: str,
+        title: str,
+        message: str,
+        data: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Send a notification to a Microsoft Teams integration."""
+        return await send_teams_message(
+            webhook_url=webhook_url,
+            message=message,
+            title=title,
+        )
+
+    async def _send_discord(
+        self,
+        integration: Integration,
+        webhook_url: str,
+        event_type: str,
+        title: str,
+        message: str,
+        data: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Send a notification to a Discord integration."""
+        return await send_discord_message(
+            webhook_url=webhook_url,
+            message=f"**{title}**\n{message}",
+        )
+
+    async def _send_webhook(
+        self,
+        integration: Integration,
+        webhook_url: str,
+        event_type: str,
+        title: str,
+        message: str,
+        data: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Send a notification to a generic webhook integration."""
+        return await send_webhook(
+            url=webhook_url,
+            payload={
+                "event": event_type,
+                "title": title,
+                "message": message,
+                "timestamp": _now_iso(),
+                "data": data or {},
+            },
+        )
 
 
 # Global notification manager instance
@@ -535,3 +1273,14 @@ def get_notification_manager() -> NotificationManager:
     if _notification_manager is None:
         _notification_manager = NotificationManager()
     return _notification_manager
+
+
+def invalidate_integration_cache(integration_id: str) -> None:
+    """
+    Invalidate cached data for an integration.
+
+    Should be called after an integration or its credentials change.
+    """
+    if _notification_manager is not None:
+        _notification_manager.invalidate_integrations()
+        _notification_manager.invalidate_credentials(integration_id)
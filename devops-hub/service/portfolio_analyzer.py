@@ -3,22 +3,187 @@ Solution Portfolio Analyzer - Comprehensive project intelligence and monetizatio
 """
 
 import asyncio
+import hashlib
+import mmap
+import os
+import shutil
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 import subprocess
 import json
 import re
 import logging
 
+# Use pyahocorasick for keyword scanning if available, fall back to a compiled regex
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Use orjson for parsing project JSON files if available, fall back to json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Absolute path to git: with it and close_fds=False, subprocess can start
+# git via posix_spawn instead of forking this (potentially large) process.
+# Python creates its own descriptors non-inheritable, so nothing leaks.
+_GIT_EXECUTABLE = shutil.which("git") or "git"
+
+# Projects analyzed at once by scan_all_projects_async; bounds both the git
+# subprocesses and the worker threads doing file scans
+_SCAN_CONCURRENCY = min(32, (os.cpu_count() or 1) * 2)
+
+# Files whose mtime and size feed a project's fingerprint, alongside the
+# project directory itself (entries added or removed) and the git HEAD
+_FINGERPRINT_FILES = ("package.json", "requirements.txt", "pyproject.toml", "PROJECT_META.json", ".git/index")
+
+# Fingerprint-matched results are reused for at most this long, since
+# unstaged working tree edits don't show up in the fingerprint
+_FINGERPRINT_CACHE_TTL = 120
+
+# In-process analysis results: project path -> (fingerprint, result, stored at)
+_analysis_cache: Dict[str, Tuple[bytes, Dict[str, Any], float]] = {}
+
+# JSON files at least this large are parsed straight from a read-only
+# mapping of the file (orjson only) rather than from a copied buffer
+_MMAP_THRESHOLD = 256 * 1024
+
+# Source file types scanned for revenue indicators
+_SOURCE_SUFFIXES = frozenset({".ts", ".tsx", ".js", ".jsx", ".py"})
+
+# Dependency, build and VCS directories never walked into when scanning sources
+_SKIP_SOURCE_DIRS = frozenset({"node_modules", ".git", "__pycache__", "dist", "build", ".venv", "venv"})
+
+
+# Files or directories whose presence marks a directory as a project
+_PROJECT_MARKERS = frozenset({".git", "package.json", "requirements.txt", "pyproject.toml", "Dockerfile"})
+
+
+def _snapshot_entries(path: Union[str, Path]) -> frozenset:
+    """Names of the entries directly inside path, from a single directory read."""
+    try:
+        with os.scandir(path) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _fingerprint(path: Path) -> bytes:
+    """Cheap digest of a project's state, computed without running git."""
+    root = os.fspath(path)
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(os.path.join(root, ".git", "HEAD"), "rb") as f:
+            head = f.read().strip()
+        digest.update(head)
+        if head.startswith(b"ref: "):
+            # Branch tip: loose ref file if present, else whatever packed-refs holds
+            ref = head[5:].decode("utf-8", errors="replace")
+            with open(os.path.join(root, ".git", ref), "rb") as f:
+                digest.update(f.read())
+    except OSError:
+        pass
+    for name in ("", ".git/packed-refs", *_FINGERPRINT_FILES):
+        try:
+            st = os.stat(os.path.join(root, name))
+            digest.update(f"{name}:{st.st_mtime_ns}:{st.st_size};".encode())
+        except OSError:
+            digest.update(f"{name}:-;".encode())
+    return digest.digest()
+
+
+def _drop_cached_analyses(project_names: Optional[List[str]]) -> None:
+    """Portfolio cache invalidation listener: forget in-process results for the named projects (None: all)."""
+    if project_names is None:
+        _analysis_cache.clear()
+        return
+    names = set(project_names)
+    for key in [key for key in _analysis_cache if os.path.basename(key) in names]:
+        del _analysis_cache[key]
+
+
+def _project_sort_key(project: Dict[str, Any]) -> Tuple[bool, Any, float]:
+    """
+    Portfolio order: 1) has_metadata (True first), 2) priority (lower
+    first), 3) monetization score (higher first).
+
+    list.sort calls this once per project, not per comparison.
+    """
+    return (
+        not project.get("has_metadata", False),  # Projects with metadata first
+        project.get("priority", 5),               # Lower priority number = higher priority
+        -project["monetization"]["score"],        # Higher score = higher rank
+    )
+
+
+def _load_json(file_path: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(file_path, "rb") as f:
+        if HAS_ORJSON and os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+        raw = f.read()
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_package_json(path: Path) -> Optional[Dict[str, Any]]:
+    """Parse a project's package.json; None if absent, empty if unreadable."""
+    try:
+        data = _load_json(os.path.join(path, "package.json"))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _iter_source_files(root: str):
+    """Yield the names of source files under root, pruning skipped directories."""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in _SKIP_SOURCE_DIRS:
+                            stack.append(entry.path)
+                    elif os.path.splitext(name)[1] in _SOURCE_SUFFIXES and entry.is_file(follow_symlinks=False):
+                        yield name
+                except OSError:
+                    continue
+
 
 class GitStatus:
     """Git repository status information."""
-    def __init__(self, path: Path):
+
+    # One status call gives branch, upstream, ahead/behind and file states,
+    # one log call the last commit and one config call the remote URLs;
+    # none depends on another, so they all run at once
+    _COMMANDS = (
+        ("status", "--porcelain=v2", "--branch"),
+        ("log", "-1", "--format=%H%x00%s%x00%ci"),
+        ("config", "--get-regexp", r"^remote\..+\.url$"),
+    )
+
+    def __init__(self, path: Path, analyze: bool = True):
         self.path = path
-        self.is_repo = (path / ".git").exists()
+        self.is_repo = os.path.exists(os.path.join(path, ".git"))
         self.branch = ""
         self.ahead = 0
         self.behind = 0
@@ -28,54 +193,114 @@ class GitStatus:
         self.remote = ""
         self.last_commit = ""
         self.last_commit_date = ""
+        self.head_commit = ""
         
-        if self.is_repo:
+        if self.is_repo and analyze:
             self._analyze()
+
+    @classmethod
+    async def create(cls, path: Path) -> "GitStatus":
+        """Build a GitStatus without blocking the event loop."""
+        status = cls(path, analyze=False)
+        if status.is_repo:
+            try:
+                outputs = await asyncio.gather(
+                    *(status._run_git_async(*args) for args in cls._COMMANDS)
+                )
+            except NotImplementedError:
+                # Event loop without subprocess support (e.g. selector loop on Windows)
+                await asyncio.to_thread(status._analyze)
+            else:
+                status._parse(*outputs)
+        return status
     
-    def _run_git(self, *args) -> str:
-        """Run git command and return output."""
+    def _run_git_many(self, *commands) -> List[str]:
+        """Run several git commands side by side and return their outputs in order."""
+        procs = []
+        for args in commands:
+            try:
+                procs.append(subprocess.Popen(
+                    [_GIT_EXECUTABLE, "-C", str(self.path)] + list(args),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    close_fds=False,
+                ))
+            except Exception:
+                procs.append(None)
+
+        outputs = []
+        for proc in procs:
+            if proc is None:
+                outputs.append("")
+                continue
+            try:
+                stdout, _ = proc.communicate(timeout=5)
+                outputs.append(stdout.strip())
+            except Exception:
+                proc.kill()
+                proc.communicate()
+                outputs.append("")
+        return outputs
+
+    async def _run_git_async(self, *args) -> str:
+        """Run git command on the event loop and return output."""
         try:
-            result = subprocess.run(
-                ["git", "-C", str(self.path)] + list(args),
-                capture_output=True,
-                text=True,
-                timeout=5
+            proc = await asyncio.create_subprocess_exec(
+                _GIT_EXECUTABLE, "-C", str(self.path), *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                close_fds=False,
             )
-            return result.stdout.strip()
-        except Exception:
+        except OSError:
             return ""
-    
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return ""
+        return stdout.decode("utf-8", errors="replace").strip()
+
     def _analyze(self):
         """Analyze git repository status."""
-        self.branch = self._run_git("rev-parse", "--abbrev-ref", "HEAD")
-        
-        # Get remote info
-        remote_url = self._run_git("config", "--get", f"branch.{self.branch}.remote")
-        if remote_url:
-            full_url = self._run_git("remote", "get-url", remote_url)
-            self.remote = full_url
-        
-        # Get ahead/behind count
-        tracking = self._run_git("rev-list", "--left-right", "--count", f"{self.branch}...@{{u}}")
-        if tracking and "\t" in tracking:
-            parts = tracking.split("\t")
-            self.ahead = int(parts[0])
-            self.behind = int(parts[1])
-        
-        # Get status
-        status = self._run_git("status", "--porcelain")
-        if status:
-            for line in status.split("\n"):
-                if line.startswith("??"):
-                    self.untracked += 1
-                elif line[0] in "MARC":
+        self._parse(*self._run_git_many(*self._COMMANDS))
+
+    def _parse(self, status: str, last_log: str, remote_urls: str):
+        """Fill in fields from the outputs of _COMMANDS."""
+        upstream = ""
+        for line in status.split("\n"):
+            if line.startswith("# branch.head "):
+                self.branch = line[14:]
+            elif line.startswith("# branch.upstream "):
+                upstream = line[18:]
+            elif line.startswith("# branch.ab "):
+                ahead, behind = line[12:].split()
+                self.ahead = int(ahead)
+                self.behind = -int(behind)
+            elif line.startswith("? "):
+                self.untracked += 1
+            elif line[:2] in ("1 ", "2 ", "u "):
+                xy = line[2:4]
+                if xy[0] in "MARC":
                     self.staged += 1
-                elif line[1] in "M":
+                elif xy[1] == "M":
                     self.modified += 1
-        
+
+        if self.branch == "(detached)":
+            self.branch = "HEAD"
+
+        # Get remote info; upstream is "<remote>/<branch>"
+        if upstream:
+            for line in remote_urls.split("\n"):
+                key, _, url = line.partition(" ")
+                if upstream.startswith(key[7:-4] + "/"):
+                    self.remote = url
+                    break
+
         # Get last commit
-        self.last_commit = self._run_git("log", "-1", "--format=%s")
-        self.last_commit_date = self._run_git("log", "-1", "--format=%ci")
+        if last_log:
+            self.head_commit, self.last_commit, self.last_commit_date = last_log.split("\x00")
 
 
 class MonetizationAnalyzer:
@@ -120,90 +345,95 @@ class MonetizationAnalyzer:
         "agent": 25,
     }
     
+    # Revenue streams and the signals that suggest each, any one sufficing
+    STREAM_RULES = (
+        (frozenset({"stripe", "payment", "checkout"}), "Direct Payments"),
+        (frozenset({"subscription", "billing"}), "Subscription Model"),
+        (frozenset({"api"}), "API Access"),
+        (frozenset({"marketplace"}), "Marketplace Fees"),
+        (frozenset({"affiliate"}), "Affiliate Revenue"),
+        (frozenset({"ad"}), "Advertising"),
+        (frozenset({"saas"}), "SaaS Model"),
+    )
+    
+    @staticmethod
+    def _tally_lines(
+        text: str,
+        signals: set,
+        tech_stack: Optional[set] = None,
+        weight: float = 1,
+    ) -> float:
+        """
+        Score keyword hits in lowercase text line by line, recording signals
+        found and, if tech_stack is given, technologies found.
+        """
+        score = 0
+        for _, keyword in _keyword_hits_by_line(text):
+            points = MonetizationAnalyzer.REVENUE_SIGNALS.get(keyword)
+            if points is not None:
+                score += points * weight
+                signals.add(keyword)
+            if tech_stack is not None and keyword in MonetizationAnalyzer.TECH_SCORES:
+                tech_stack.add(keyword)
+        return score
+
     @staticmethod
-    def analyze(path: Path) -> Dict[str, Any]:
-        """Analyze monetization potential of a project."""
+    def analyze(
+        path: Path,
+        pkg_data: Optional[Dict[str, Any]] = None,
+        entries: Optional[frozenset] = None,
+    ) -> Dict[str, Any]:
+        """
+        Analyze monetization potential of a project.
+
+        pkg_data is the parsed package.json and entries the project
+        directory's entry names, if the caller already has them; with
+        entries, files and directories that aren't there are never probed.
+        """
         score = 0
-        signals = []
-        tech_stack = []
-        revenue_streams = []
+        signals = set()
+        tech_stack = set()
         
         # Scan package files
-        package_json = path / "package.json"
-        pyproject = path / "pyproject.toml"
-        requirements = path / "requirements.txt"
+        root = os.fspath(path)
+        if pkg_data is None and (entries is None or "package.json" in entries):
+            pkg_data = _read_package_json(path)
         
-        if package_json.exists():
+        if pkg_data:
             try:
-                with open(package_json) as f:
-                    data = json.load(f)
-                    deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-                    
-                    for dep in deps.keys():
-                        dep_lower = dep.lower()
-                        for signal, points in MonetizationAnalyzer.REVENUE_SIGNALS.items():
-                            if signal in dep_lower:
-                                score += points
-                                if signal not in signals:
-                                    signals.append(signal)
-                        
-                        for tech, points in MonetizationAnalyzer.TECH_SCORES.items():
-                            if tech in dep_lower:
-                                if tech not in tech_stack:
-                                    tech_stack.append(tech)
+                deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
+                # One dependency name per line, scanned together
+                dep_text = "\n".join(deps).lower()
             except Exception:
-                pass
+                dep_text = ""
+            score += MonetizationAnalyzer._tally_lines(dep_text, signals, tech_stack)
         
-        if requirements.exists():
+        if entries is None or "requirements.txt" in entries:
             try:
-                with open(requirements) as f:
-                    for line in f:
-                        line_lower = line.lower()
-                        for signal, points in MonetizationAnalyzer.REVENUE_SIGNALS.items():
-                            if signal in line_lower:
-                                score += points
-                                if signal not in signals:
-                                    signals.append(signal)
-                        
-                        for tech, points in MonetizationAnalyzer.TECH_SCORES.items():
-                            if tech in line_lower:
-                                if tech not in tech_stack:
-                                    tech_stack.append(tech)
-            except Exception:
-                pass
+                with open(os.path.join(root, "requirements.txt"), encoding="utf-8", errors="ignore") as f:
+                    requirements_text = f.read().lower()
+            except OSError:
+                requirements_text = ""
+            score += MonetizationAnalyzer._tally_lines(requirements_text, signals, tech_stack)
         
         # Scan source files for revenue indicators
         source_dirs = ["src", "app", "pages", "components", "lib", "service", "api"]
-        for src_dir in source_dirs:
-            src_path = path / src_dir
-            if src_path.exists():
-                try:
-                    for file_path in src_path.rglob("*"):
-                        if file_path.is_file() and file_path.suffix in [".ts", ".tsx", ".js", ".jsx", ".py"]:
-                            file_lower = file_path.name.lower()
-                            for signal, points in MonetizationAnalyzer.REVENUE_SIGNALS.items():
-                                if signal in file_lower:
-                                    score += points * 0.5
-                                    if signal not in signals:
-                                        signals.append(signal)
-                except Exception:
-                    pass
+        if entries is not None:
+            source_dirs = [src_dir for src_dir in source_dirs if src_dir in entries]
+        # File names are scanned together, one per line, lowercased once;
+        # a name earns half the points of a dependency
+        file_names = "\n".join(
+            file_name
+            for src_dir in source_dirs
+            for file_name in _iter_source_files(os.path.join(root, src_dir))
+        ).lower()
+        score += MonetizationAnalyzer._tally_lines(file_names, signals, weight=0.5)
         
         # Determine revenue streams based on signals
-        if "stripe" in signals or "payment" in signals or "checkout" in signals:
-            revenue_streams.append("Direct Payments")
-        if "subscription" in signals or "billing" in signals:
-            revenue_streams.append("Subscription Model")
-        if "api" in signals:
-            revenue_streams.append("API Access")
-        if "marketplace" in signals:
-            revenue_streams.append("Marketplace Fees")
-        if "affiliate" in signals:
-            revenue_streams.append("Affiliate Revenue")
-        if "ad" in signals:
-            revenue_streams.append("Advertising")
-        if "saas" in signals:
-            revenue_streams.append("SaaS Model")
+        revenue_streams = [
+            stream for needed, stream in MonetizationAnalyzer.STREAM_RULES
+            if not needed.isdisjoint(signals)
+        ]
         
         # Normalize score to 0-100
         normalized_score = min(100, score)
@@ -221,37 +451,96 @@ class MonetizationAnalyzer:
         return {
             "score": normalized_score,
             "category": category,
-            "signals": signals,
-            "tech_stack": tech_stack,
+            "signals": sorted(signals),
+            "tech_stack": sorted(tech_stack),
             "revenue_streams": revenue_streams,
         }
 
 
+# Every keyword MonetizationAnalyzer looks for, matched in one pass per string
+_KEYWORDS = tuple(dict.fromkeys([*MonetizationAnalyzer.REVENUE_SIGNALS, *MonetizationAnalyzer.TECH_SCORES]))
+
+if HAS_AHOCORASICK:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+
+# Regex fallback: a zero-width lookahead tried at every position finds the
+# longest keyword starting there; shorter keywords inside it ("ad" in
+# "admin") come from _KEYWORDS_WITHIN so overlapping hits aren't lost
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(sorted(map(re.escape, _KEYWORDS), key=len, reverse=True)) + "))"
+)
+_KEYWORDS_WITHIN = {
+    keyword: frozenset(other for other in _KEYWORDS if other in keyword)
+    for keyword in _KEYWORDS
+}
+
+
+def _keyword_hits_by_line(text: str) -> set:
+    """
+    Scan lowercase multi-line text for keywords in one pass.
+
+    Returns (line offset, keyword) pairs, so each keyword is reported once
+    per line it occurs on, as if every line were checked separately.
+    """
+    if HAS_AHOCORASICK:
+        return {(text.rfind("\n", 0, end), keyword) for end, keyword in _KEYWORD_AUTOMATON.iter(text)}
+    hits = set()
+    for match in _KEYWORD_RE.finditer(text):
+        line = text.rfind("\n", 0, match.start())
+        hits.update((line, keyword) for keyword in _KEYWORDS_WITHIN[match.group(1)])
+    return hits
+
+
 class ProjectMetadata:
     """Read and parse PROJECT_META.json files from projects."""
 
     METADATA_FILENAME = "PROJECT_META.json"
 
     @staticmethod
-    def read(path: Path) -> Optional[Dict[str, Any]]:
-        """Read PROJECT_META.json from a project directory."""
-        meta_file = path / ProjectMetadata.METADATA_FILENAME
-        if not meta_file.exists():
+    def read(path: Path, entries: Optional[frozenset] = None) -> Optional[Dict[str, Any]]:
+        """
+        Read PROJECT_META.json from a project directory.
+
+        entries, the directory's entry names if already listed, saves a
+        stat when the file isn't there.
+        """
+        if entries is not None and ProjectMetadata.METADATA_FILENAME not in entries:
+            return None
+        meta_file = os.path.join(path, ProjectMetadata.METADATA_FILENAME)
+        try:
+            mtime_ns = os.stat(meta_file).st_mtime_ns
+        except OSError:
+            return None
+
+        # Parsed results are cached until the file's mtime changes
+        try:
+            return ProjectMetadata._read_cached(meta_file, mtime_ns)
+        except OSError as e:
+            logger.warning(f"Error reading PROJECT_META.json from {path.name}: {e}")
             return None
 
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _read_cached(meta_file: str, mtime_ns: int) -> Optional[Dict[str, Any]]:
+        """Parse and validate PROJECT_META.json; read errors propagate uncached."""
+        project_name = os.path.basename(os.path.dirname(meta_file))
         try:
-            with open(meta_file) as f:
-                data = json.load(f)
-                # Validate required fields
-                if "name" not in data or "status" not in data:
-                    logger.warning(f"Invalid PROJECT_META.json in {path.name}: missing required fields")
-                    return None
-                return data
+            data = _load_json(meta_file)
+            # Validate required fields
+            if "name" not in data or "status" not in data:
+                logger.warning(f"Invalid PROJECT_META.json in {project_name}: missing required fields")
+                return None
+            return data
+        except OSError:
+            raise
         except json.JSONDecodeError as e:
-            logger.warning(f"Invalid JSON in {path.name}/PROJECT_META.json: {e}")
+            logger.warning(f"Invalid JSON in {project_name}/PROJECT_META.json: {e}")
             return None
         except Exception as e:
-            logger.warning(f"Error reading PROJECT_META.json from {path.name}: {e}")
+            logger.warning(f"Error reading PROJECT_META.json from {project_name}: {e}")
             return None
 
     @staticmethod
@@ -325,6 +614,8 @@ class ProjectAnalyzer:
             try:
                 from service.portfolio_cache import get_portfolio_cache
                 self._cache = get_portfolio_cache()
+                # Invalidating a project must also drop its fingerprint-matched result
+                self._cache.add_invalidation_listener(_drop_cached_analyses)
             except ImportError:
                 logger.warning("Portfolio cache not available")
                 self._cache = None
@@ -336,6 +627,15 @@ class ProjectAnalyzer:
         
         Checks cache first, then performs analysis if needed.
         """
+        # Reuse the last in-process result while the project's fingerprint is unchanged
+        key = str(path)
+        fingerprint = _fingerprint(path)
+        if self.use_cache:
+            entry = _analysis_cache.get(key)
+            if entry and entry[0] == fingerprint and time.monotonic() - entry[2] < _FINGERPRINT_CACHE_TTL:
+                logger.debug(f"Fingerprint hit for project: {path.name}")
+                return entry[1]
+
         # Try cache first
         if self.cache and self.cache.is_available:
             cached = await self.cache.get_project(path.name)
@@ -343,8 +643,15 @@ class ProjectAnalyzer:
                 logger.debug(f"Cache hit for project: {path.name}")
                 return cached
         
-        # Perform analysis
-        project_data = self.analyze_project(path)
+        # Perform analysis: the git commands run on the event loop while the
+        # blocking file reads and scans run in a worker thread, overlapping
+        # the two; combining them afterwards touches no disk
+        git_status, files = await asyncio.gather(
+            GitStatus.create(path),
+            asyncio.to_thread(self._scan_files, path),
+        )
+        project_data = self.analyze_project(path, git_status, files)
+        _analysis_cache[key] = (fingerprint, project_data, time.monotonic())
         
         # Cache the result
         if self.cache and self.cache.is_available:
@@ -352,20 +659,44 @@ class ProjectAnalyzer:
         
         return project_data
     
-    def analyze_project(self, path: Path) -> Dict[str, Any]:
-        """Analyze a single project (synchronous)."""
-        git_status = GitStatus(path)
-        monetization = MonetizationAnalyzer.analyze(path)
+    def _scan_files(self, path: Path) -> Tuple[frozenset, Dict[str, Any], str, Optional[Dict[str, Any]]]:
+        """
+        Do all of a project's file reads: the directory listing, the
+        monetization scan, type detection and PROJECT_META.json.
+        """
+        # List the project directory once for every file-presence check
+        entries = _snapshot_entries(path)
+        # Parse package.json once for both the monetization scan and type detection
+        pkg_data = _read_package_json(path) if "package.json" in entries else None
+        monetization = MonetizationAnalyzer.analyze(path, pkg_data=pkg_data, entries=entries)
+        project_type = self._detect_project_type(path, pkg_data=pkg_data, entries=entries)
+        metadata = ProjectMetadata.read(path, entries=entries)
+        return entries, monetization, project_type, metadata
 
-        # Determine project type
-        project_type = self._detect_project_type(path)
+    def analyze_project(
+        self,
+        path: Path,
+        git_status: Optional[GitStatus] = None,
+        files: Optional[Tuple[frozenset, Dict[str, Any], str, Optional[Dict[str, Any]]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Analyze a single project (synchronous).
+
+        git_status and files (the result of _scan_files) are gathered here
+        unless the caller already has them.
+        """
+        if git_status is None:
+            git_status = GitStatus(path)
+        if files is None:
+            files = self._scan_files(path)
+        entries, monetization, project_type, metadata = files
 
         # Calculate health score
-        health_score = self._calculate_health(path, git_status)
+        health_score = self._calculate_health(path, git_status, entries=entries)
 
         # Generate recommendations
         recommendations = self._generate_recommendations(
-            path, git_status, monetization, health_score
+            path, git_status, monetization, health_score, entries=entries
         )
 
         # Base analysis result
@@ -400,24 +731,25 @@ class ProjectAnalyzer:
             "blocker_count": len([r for r in recommendations if r["type"] in ["critical", "high"]]),
         }
 
-        # Read and merge PROJECT_META.json if it exists
-        metadata = ProjectMetadata.read(path)
+        # Merge PROJECT_META.json if it exists
         if metadata:
             analysis = ProjectMetadata.merge_with_analysis(metadata, analysis)
             logger.debug(f"Merged metadata for project: {path.name}")
 
         return analysis
     
-    def _detect_project_type(self, path: Path) -> str:
+    def _detect_project_type(
+        self,
+        path: Path,
+        pkg_data: Optional[Dict[str, Any]] = None,
+        entries: Optional[frozenset] = None,
+    ) -> str:
         """Detect project type based on files present."""
-        if (path / "package.json").exists():
-            pkg_data = {}
-            try:
-                with open(path / "package.json") as f:
-                    pkg_data = json.load(f)
-            except Exception:
-                pass
-            
+        if entries is None:
+            entries = _snapshot_entries(path)
+        if pkg_data is None and "package.json" in entries:
+            pkg_data = _read_package_json(path)
+        if pkg_data is not None:
             deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
             if "next" in deps:
                 return "Next.js Application"
@@ -428,23 +760,34 @@ class ProjectAnalyzer:
             else:
                 return "Node.js Application"
         
-        if (path / "requirements.txt").exists() or (path / "pyproject.toml").exists():
-            if (path / "fastapi").exists() or any((path / "service").glob("*api*.py")):
+        if "requirements.txt" in entries or "pyproject.toml" in entries:
+            if "fastapi" in entries or ("service" in entries and self._has_api_module(os.path.join(path, "service"))):
                 return "FastAPI Application"
-            elif (path / "manage.py").exists():
+            elif "manage.py" in entries:
                 return "Django Application"
-            elif (path / "app.py").exists() or (path / "main.py").exists():
+            elif "app.py" in entries or "main.py" in entries:
                 return "Python Application"
             else:
                 return "Python Project"
         
-        if (path / "Dockerfile").exists():
+        if "Dockerfile" in entries:
             return "Containerized Application"
         
         return "Unknown"
     
-    def _calculate_health(self, path: Path, git_status: GitStatus) -> int:
+    @staticmethod
+    def _has_api_module(service_dir: str) -> bool:
+        """Whether service_dir has an entry matching *api*.py."""
+        try:
+            with os.scandir(service_dir) as it:
+                return any(e.name.endswith(".py") and "api" in e.name[:-3] for e in it)
+        except OSError:
+            return False
+
+    def _calculate_health(self, path: Path, git_status: GitStatus, entries: Optional[frozenset] = None) -> int:
         """Calculate project health score (0-100)."""
+        if entries is None:
+            entries = _snapshot_entries(path)
         score = 50
         
         # Git health
@@ -460,19 +803,19 @@ class ProjectAnalyzer:
             score -= 20
         
         # Documentation
-        if (path / "README.md").exists():
+        if "README.md" in entries:
             score += 5
         
         # Configuration
-        if (path / ".env.example").exists() or (path / ".env.template").exists():
+        if ".env.example" in entries or ".env.template" in entries:
             score += 5
         
         # Testing
-        if (path / "tests").exists() or (path / "__tests__").exists():
+        if "tests" in entries or "__tests__" in entries:
             score += 10
         
         # Docker support
-        if (path / "Dockerfile").exists():
+        if "Dockerfile" in entries:
             score += 5
         
         return max(0, min(100, score))
@@ -494,8 +837,11 @@ class ProjectAnalyzer:
         git_status: GitStatus,
         monetization: Dict[str, Any],
         health_score: int,
+        entries: Optional[frozenset] = None,
     ) -> List[Dict[str, str]]:
         """Generate actionable recommendations."""
+        if entries is None:
+            entries = _snapshot_entries(path)
         recommendations = []
         
         # Git recommendations
@@ -565,7 +911,7 @@ class ProjectAnalyzer:
         
         # Health recommendations
         if health_score < 60:
-            if not (path / "README.md").exists():
+            if "README.md" not in entries:
                 recommendations.append({
                     "type": "medium",
                     "category": "Documentation",
@@ -573,7 +919,7 @@ class ProjectAnalyzer:
                     "impact": "Improve project clarity and onboarding",
                 })
             
-            if not ((path / "tests").exists() or (path / "__tests__").exists()):
+            if not ("tests" in entries or "__tests__" in entries):
                 recommendations.append({
                     "type": "medium",
                     "category": "Quality",
@@ -583,10 +929,16 @@ class ProjectAnalyzer:
         
         return recommendations
     
-    async def scan_all_projects_async(self) -> List[Dict[str, Any]]:
+    async def scan_all_projects_async(
+        self,
+        progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Scan all projects in parallel with caching.
         
+        progress_cb, if given, is called with each project's analysis as
+        soon as it is available, so callers can stream partial results.
+        
         Returns list of projects sorted by monetization score.
         """
         # Try cache first
@@ -594,27 +946,40 @@ class ProjectAnalyzer:
             cached = await self.cache.get_all_projects()
             if cached:
                 logger.debug("Cache hit for all projects")
+                if progress_cb:
+                    for project in cached:
+                        progress_cb(project)
                 return cached
         
         # Get list of project directories
         project_dirs = self._discover_projects()
         
-        # Analyze projects in parallel
-        tasks = [self.analyze_project_async(path) for path in project_dirs]
-        projects = await asyncio.gather(*tasks, return_exceptions=True)
+        # Analyze projects in parallel, a bounded number at a time
+        semaphore = asyncio.Semaphore(_SCAN_CONCURRENCY)
+
+        async def analyze_bounded(index: int, path: Path) -> Tuple[int, Optional[Dict[str, Any]]]:
+            async with semaphore:
+                try:
+                    return index, await self.analyze_project_async(path)
+                except Exception as e:
+                    logger.error(f"Error analyzing {path.name}: {e}")
+                    return index, None
+
+        # Handle results as they finish, slotting them back into discovery
+        # order so projects that tie in the sort below keep a stable order
+        projects: List[Optional[Dict[str, Any]]] = [None] * len(project_dirs)
+        tasks = [analyze_bounded(index, path) for index, path in enumerate(project_dirs)]
+        for next_done in asyncio.as_completed(tasks):
+            index, project = await next_done
+            if project:
+                projects[index] = project
+                if progress_cb:
+                    progress_cb(project)
         
         # Filter out errors and None values
-        valid_projects = [
-            p for p in projects
-            if p and not isinstance(p, Exception)
-        ]
+        valid_projects = [p for p in projects if p]
 
-        # Sort by: 1) has_metadata (True first), 2) priority (lower first), 3) monetization score (higher first)
-        valid_projects.sort(key=lambda x: (
-            not x.get("has_metadata", False),  # Projects with metadata first
-            x.get("priority", 5),               # Lower priority number = higher priority
-            -x["monetization"]["score"],        # Higher score = higher rank
-        ))
+        valid_projects.sort(key=_project_sort_key)
         
         # Cache the result
         if self.cache and self.cache.is_available:
@@ -631,24 +996,17 @@ class ProjectAnalyzer:
         projects = []
         parent_dir = self.root_path.parent
         
-        for item in parent_dir.iterdir():
-            if item.is_dir() and not item.name.startswith("."):
-                # Skip common non-project directories
-                skip_dirs = {"node_modules", "__pycache__", "venv", ".venv", "dist", "build"}
-                if item.name in skip_dirs:
+        # Skip common non-project directories
+        skip_dirs = {"node_modules", "__pycache__", "venv", ".venv", "dist", "build"}
+        
+        with os.scandir(parent_dir) as it:
+            for entry in it:
+                if entry.name.startswith(".") or entry.name in skip_dirs or not entry.is_dir():
                     continue
                 
                 # Check if it's a project (has common project files)
-                is_project = any([
-                    (item / ".git").exists(),
-                    (item / "package.json").exists(),
-                    (item / "requirements.txt").exists(),
-                    (item / "pyproject.toml").exists(),
-                    (item / "Dockerfile").exists(),
-                ])
-                
-                if is_project:
-                    projects.append(item)
+                if not _PROJECT_MARKERS.isdisjoint(_snapshot_entries(entry.path)):
+                    projects.append(parent_dir / entry.name)
         
         return projects
     
@@ -664,12 +1022,7 @@ class ProjectAnalyzer:
             except Exception as e:
                 logger.error(f"Error analyzing {path.name}: {e}")
 
-        # Sort by: 1) has_metadata (True first), 2) priority (lower first), 3) monetization score (higher first)
-        projects.sort(key=lambda x: (
-            not x.get("has_metadata", False),  # Projects with metadata first
-            x.get("priority", 5),               # Lower priority number = higher priority
-            -x["monetization"]["score"],        # Higher score = higher rank
-        ))
+        projects.sort(key=_project_sort_key)
 
         return projects
     
@@ -704,23 +1057,31 @@ class ProjectAnalyzer:
     def _compute_summary(self, projects: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Compute portfolio summary from projects list."""
         total_projects = len(projects)
-        high_potential = sum(1 for p in projects if p["monetization"]["score"] >= 70)
-        medium_potential = sum(1 for p in projects if 40 <= p["monetization"]["score"] < 70)
-        low_potential = sum(1 for p in projects if 20 <= p["monetization"]["score"] < 40)
+        high_potential = medium_potential = low_potential = 0
+        revenue_ready = total_recommendations = critical_actions = revenue_opportunities = 0
         
-        revenue_ready = sum(1 for p in projects if p["monetization"]["revenue_streams"])
-        
-        total_recommendations = sum(len(p["recommendations"]) for p in projects)
-        critical_actions = sum(
-            1 for p in projects
-            for r in p["recommendations"]
-            if r["type"] == "critical"
-        )
-        revenue_opportunities = sum(
-            1 for p in projects
-            for r in p["recommendations"]
-            if r["type"] == "revenue"
-        )
+        # Tally every counter in one pass over the projects
+        for p in projects:
+            monetization = p["monetization"]
+            score = monetization["score"]
+            if score >= 70:
+                high_potential += 1
+            elif score >= 40:
+                medium_potential += 1
+            elif score >= 20:
+                low_potential += 1
+            
+            if monetization["revenue_streams"]:
+                revenue_ready += 1
+            
+            recommendations = p["recommendations"]
+            total_recommendations += len(recommendations)
+            for r in recommendations:
+                rec_type = r["type"]
+                if rec_type == "critical":
+                    critical_actions += 1
+                elif rec_type == "revenue":
+                    revenue_opportunities += 1
         
         return {
             "total_projects": total_projects,
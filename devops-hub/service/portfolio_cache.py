@@ -12,9 +12,12 @@ import asyncio
 import hashlib
 import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 from service.redis_client import get_redis_client
@@ -22,43 +25,55 @@ from service.redis_client import get_redis_client
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _path_hash(project_path: str) -> str:
+    """
+    Short stable hash of a project path for use in cache keys.
+
+    Always md5, with no optional faster hash: every worker sharing the
+    cache must derive the same key for the same path.
+    """
+    return hashlib.md5(project_path.encode()).hexdigest()[:8]
+
+
 @dataclass
 class CacheKey:
     """Cache key builder for portfolio data."""
     
     PREFIX = "portfolio"
+    SUMMARY = f"{PREFIX}:summary"
+    ALL_PROJECTS = f"{PREFIX}:all_projects"
+    RECOMMENDATIONS = f"{PREFIX}:recommendations"
     
-    @staticmethod
-    def summary() -> str:
+    @classmethod
+    def summary(cls) -> str:
         """Cache key for portfolio summary."""
-        return f"{CacheKey.PREFIX}:summary"
+        return cls.SUMMARY
     
-    @staticmethod
-    def all_projects() -> str:
+    @classmethod
+    def all_projects(cls) -> str:
         """Cache key for all projects list."""
-        return f"{CacheKey.PREFIX}:all_projects"
+        return cls.ALL_PROJECTS
     
     @staticmethod
     def project(project_name: str) -> str:
         """Cache key for specific project."""
         return f"{CacheKey.PREFIX}:project:{project_name}"
     
-    @staticmethod
-    def recommendations() -> str:
+    @classmethod
+    def recommendations(cls) -> str:
         """Cache key for recommendations."""
-        return f"{CacheKey.PREFIX}:recommendations"
+        return cls.RECOMMENDATIONS
     
     @staticmethod
     def git_status(project_path: str) -> str:
         """Cache key for git status."""
-        path_hash = hashlib.md5(str(project_path).encode()).hexdigest()[:8]
-        return f"{CacheKey.PREFIX}:git:{path_hash}"
+        return f"{CacheKey.PREFIX}:git:{_path_hash(str(project_path))}"
     
     @staticmethod
     def monetization(project_path: str) -> str:
         """Cache key for monetization analysis."""
-        path_hash = hashlib.md5(str(project_path).encode()).hexdigest()[:8]
-        return f"{CacheKey.PREFIX}:monetization:{path_hash}"
+        return f"{CacheKey.PREFIX}:monetization:{_path_hash(str(project_path))}"
 
 
 class PortfolioCache:
@@ -70,6 +85,8 @@ class PortfolioCache:
     - TTL-based expiration with different tiers
     - Batch invalidation for related keys
     - Cache warming on startup
+    - Write-behind SETs batched by a background task once started
+    - In-process project cache kept fresh by pub/sub invalidation events
     """
     
     # Cache TTLs in seconds
@@ -78,9 +95,32 @@ class PortfolioCache:
     TTL_LONG = 1800         # 30 minutes - summary data
     TTL_GIT = 120           # 2 minutes - git status
     
+    # Pattern invalidation: SCAN batch size hint, and keys per DEL
+    SCAN_COUNT = 1000
+    DELETE_BATCH_SIZE = 500
+    
+    # Write-behind: most queued SETs sent per pipeline
+    WRITE_BATCH_SIZE = 64
+    
+    # Invalidation events, and the in-process project cache they purge
+    INVALIDATION_CHANNEL = f"{CacheKey.PREFIX}:invalidate"
+    LOCAL_TTL = TTL_SHORT   # backstop for missed events
+    LOCAL_MAX_PROJECTS = 1024
+    
     def __init__(self):
         self.redis = get_redis_client()
         self._last_invalidation = datetime.utcnow()
+        # Queued writes as (key, value, ttl, project name or None)
+        self._write_queue: "asyncio.Queue[Tuple[str, Any, int, Optional[str]]]" = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        # Lookups in progress, by cache key, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Project details by name, as (expiry, data); only used while
+        # subscribed to invalidation events
+        self._local_projects: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._listening = False
+        # Called with the invalidated project names, or None for everything
+        self._invalidation_listeners: List[Callable[[Optional[List[str]]], None]] = []
     
     @property
     def is_available(self) -> bool:
@@ -89,29 +129,67 @@ class PortfolioCache:
     
     # ============ Get Methods ============
     
+    async def _singleflight(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run loader for key, or join the run already in progress for it.
+        
+        Concurrent misses on the same key then cost one lookup. Callers share
+        the result object, so treat it as read-only.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller being cancelled doesn't cancel the others' lookup
+        return await asyncio.shield(task)
+    
     async def get_summary(self) -> Optional[Dict[str, Any]]:
         """Get cached portfolio summary."""
         if not self.is_available:
             return None
-        return await self.redis.get_json(CacheKey.summary())
+        return await self._singleflight(
+            CacheKey.SUMMARY, lambda: self.redis.get_json(CacheKey.SUMMARY)
+        )
     
     async def get_all_projects(self) -> Optional[List[Dict[str, Any]]]:
         """Get cached projects list."""
         if not self.is_available:
             return None
-        return await self.redis.get_json(CacheKey.all_projects())
+        return await self._singleflight(
+            CacheKey.ALL_PROJECTS, lambda: self.redis.get_json(CacheKey.ALL_PROJECTS)
+        )
     
     async def get_project(self, project_name: str) -> Optional[Dict[str, Any]]:
         """Get cached project details."""
         if not self.is_available:
             return None
-        return await self.redis.get_json(CacheKey.project(project_name))
+        if self._listening:
+            entry = self._local_projects.get(project_name)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+        
+        key = CacheKey.project(project_name)
+        data = await self._singleflight(key, lambda: self.redis.get_json(key))
+        if self._listening and data is not None:
+            local = self._local_projects
+            local[project_name] = (time.monotonic() + self.LOCAL_TTL, data)
+            local.move_to_end(project_name)
+            while len(local) > self.LOCAL_MAX_PROJECTS:
+                local.popitem(last=False)
+        return data
+    
+    async def get_projects(self, project_names: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Get cached details for several projects in one round trip, aligned with project_names."""
+        if not self.is_available:
+            return [None] * len(project_names)
+        return await self.redis.get_json_many([CacheKey.project(name) for name in project_names])
     
     async def get_recommendations(self) -> Optional[List[Dict[str, Any]]]:
         """Get cached recommendations."""
         if not self.is_available:
             return None
-        return await self.redis.get_json(CacheKey.recommendations())
+        return await self.redis.get_json(CacheKey.RECOMMENDATIONS)
     
     async def get_git_status(self, project_path: str) -> Optional[Dict[str, Any]]:
         """Get cached git status."""
@@ -127,41 +205,60 @@ class PortfolioCache:
     
     # ============ Set Methods ============
     
+    async def _write(self, key: str, data: Any, ttl: int, project: Optional[str] = None) -> bool:
+        """
+        Store a value, queuing it for the background writer when one is running.
+        
+        Queued writes return True immediately; readers tolerate the brief
+        staleness. Without a writer the SET is awaited as before. Writing a
+        project's details publishes an invalidation for it once the SET has
+        been sent, so other processes drop their local copies.
+        """
+        if self._writer_task is not None and not self._writer_task.done():
+            self._write_queue.put_nowait((key, data, ttl, project))
+            return True
+        stored = await self.redis.set_json(key, data, ttl=ttl)
+        if project is not None:
+            await self._publish_invalidation({"projects": [project]})
+        return stored
+    
     async def set_summary(self, data: Dict[str, Any]) -> bool:
         """Cache portfolio summary."""
         if not self.is_available:
             return False
-        return await self.redis.set_json(CacheKey.summary(), data, ttl=self.TTL_LONG)
+        return await self._write(CacheKey.SUMMARY, data, ttl=self.TTL_LONG)
     
     async def set_all_projects(self, projects: List[Dict[str, Any]]) -> bool:
         """Cache projects list."""
         if not self.is_available:
             return False
-        return await self.redis.set_json(CacheKey.all_projects(), projects, ttl=self.TTL_MEDIUM)
+        return await self._write(CacheKey.ALL_PROJECTS, projects, ttl=self.TTL_MEDIUM)
     
     async def set_project(self, project_name: str, data: Dict[str, Any]) -> bool:
         """Cache project details."""
         if not self.is_available:
             return False
-        return await self.redis.set_json(CacheKey.project(project_name), data, ttl=self.TTL_MEDIUM)
+        return await self._write(
+            CacheKey.project(project_name), data, ttl=self.TTL_MEDIUM, project=project_name
+        )
     
     async def set_recommendations(self, recommendations: List[Dict[str, Any]]) -> bool:
         """Cache recommendations."""
         if not self.is_available:
             return False
-        return await self.redis.set_json(CacheKey.recommendations(), recommendations, ttl=self.TTL_MEDIUM)
+        return await self._write(CacheKey.RECOMMENDATIONS, recommendations, ttl=self.TTL_MEDIUM)
     
     async def set_git_status(self, project_path: str, data: Dict[str, Any]) -> bool:
         """Cache git status."""
         if not self.is_available:
             return False
-        return await self.redis.set_json(CacheKey.git_status(project_path), data, ttl=self.TTL_GIT)
+        return await self._write(CacheKey.git_status(project_path), data, ttl=self.TTL_GIT)
     
     async def set_monetization(self, project_path: str, data: Dict[str, Any]) -> bool:
         """Cache monetization analysis."""
         if not self.is_available:
             return False
-        return await self.redis.set_json(CacheKey.monetization(project_path), data, ttl=self.TTL_LONG)
+        return await self._write(CacheKey.monetization(project_path), data, ttl=self.TTL_LONG)
     
     # ============ Invalidation Methods ============
     
@@ -172,18 +269,21 @@ class PortfolioCache:
         Returns number of keys invalidated.
         """
         if not self.is_available:
+            self._apply_invalidation({"project": project_name})
             return 0
         
+        await self.flush()
         keys = [
             CacheKey.project(project_name),
-            CacheKey.summary(),
-            CacheKey.all_projects(),
-            CacheKey.recommendations(),
+            CacheKey.SUMMARY,
+            CacheKey.ALL_PROJECTS,
+            CacheKey.RECOMMENDATIONS,
         ]
         
         count = await self.redis.delete(*keys)
         logger.info(f"Invalidated {count} cache keys for project: {project_name}")
         self._last_invalidation = datetime.utcnow()
+        await self._publish_invalidation({"project": project_name})
         return count
     
     async def invalidate_git_status(self, project_path: str) -> int:
@@ -191,6 +291,7 @@ class PortfolioCache:
         if not self.is_available:
             return 0
         
+        await self.flush()
         key = CacheKey.git_status(project_path)
         count = await self.redis.delete(key)
         logger.debug(f"Invalidated git status cache for: {project_path}")
@@ -203,33 +304,160 @@ class PortfolioCache:
         Returns number of keys invalidated.
         """
         if not self.is_available:
+            self._apply_invalidation({"all": True})
             return 0
         
+        await self.flush()
         keys = [
-            CacheKey.summary(),
-            CacheKey.all_projects(),
-            CacheKey.recommendations(),
+            CacheKey.SUMMARY,
+            CacheKey.ALL_PROJECTS,
+            CacheKey.RECOMMENDATIONS,
         ]
         
         count = await self.redis.delete(*keys)
         logger.info(f"Invalidated {count} global portfolio cache keys")
         self._last_invalidation = datetime.utcnow()
+        await self._publish_invalidation({"all": True})
         return count
     
     async def invalidate_pattern(self, pattern: str) -> int:
         """
-        Invalidate cache keys matching a pattern.
+        Invalidate cache keys matching a glob pattern.
         
-        WARNING: This requires Redis SCAN command and may be slow.
-        Use specific invalidation methods when possible.
+        The pattern is scoped to the portfolio namespace ("project:*" means
+        "portfolio:project:*"). Keys are found with incremental SCAN and
+        deleted in batches, but this still walks the whole keyspace, so
+        use specific invalidation methods when possible.
+        
+        Returns number of keys invalidated.
         """
         if not self.is_available:
             return 0
         
-        # Note: This requires redis.scan which we need to add
-        # For now, just log and return 0
-        logger.warning(f"Pattern invalidation not implemented: {pattern}")
-        return 0
+        await self.flush()
+        prefix = f"{CacheKey.PREFIX}:"
+        if not pattern.startswith(prefix):
+            pattern = prefix + pattern
+        
+        count = 0
+        batch: List[str] = []
+        async for key in self.redis.scan_iter(match=pattern, count=self.SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= self.DELETE_BATCH_SIZE:
+                count += await self.redis.delete(*batch)
+                batch = []
+        if batch:
+            count += await self.redis.delete(*batch)
+        
+        logger.info(f"Invalidated {count} cache keys matching: {pattern}")
+        if count:
+            self._last_invalidation = datetime.utcnow()
+            await self._publish_invalidation({"all": True})
+        return count
+    
+    # ============ Invalidation Events ============
+    
+    async def listen_for_invalidations(self) -> bool:
+        """
+        Subscribe to invalidation events from every process sharing this Redis.
+        
+        Until subscribed, get_project always reads Redis; afterwards project
+        details are also kept in process and dropped when an event names them.
+        """
+        if self._listening:
+            return True
+        self._listening = await self.redis.subscribe(
+            self.INVALIDATION_CHANNEL, self._on_invalidation
+        )
+        return self._listening
+    
+    def add_invalidation_listener(self, listener: Callable[[Optional[List[str]]], None]) -> None:
+        """
+        Call listener whenever projects are invalidated, here or (once
+        subscribed) in another process.
+        
+        It receives the invalidated project names, or None when everything
+        was invalidated. Fresh writes of project details are not reported.
+        """
+        if listener not in self._invalidation_listeners:
+            self._invalidation_listeners.append(listener)
+    
+    async def _publish_invalidation(self, event: Dict[str, Any]) -> None:
+        """Tell every process (this one included) to drop local copies."""
+        self._apply_invalidation(event)
+        await self.redis.publish(self.INVALIDATION_CHANNEL, event)
+    
+    def _on_invalidation(self, channel: str, message: str) -> None:
+        """Pub/sub handler for invalidation events."""
+        try:
+            self._apply_invalidation(json.loads(message))
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed invalidation event: {e}")
+    
+    def _apply_invalidation(self, event: Dict[str, Any]) -> None:
+        """Drop the local project entries an invalidation event covers."""
+        if event.get("all"):
+            self._local_projects.clear()
+            self._notify_invalidation(None)
+        elif "project" in event:
+            self._local_projects.pop(event["project"], None)
+            self._notify_invalidation([event["project"]])
+        else:
+            # Projects just rewritten; only the local copies are now stale
+            for project_name in event.get("projects", ()):
+                self._local_projects.pop(project_name, None)
+    
+    def _notify_invalidation(self, project_names: Optional[List[str]]) -> None:
+        """Pass an invalidation on to the registered listeners."""
+        for listener in self._invalidation_listeners:
+            try:
+                listener(project_names)
+            except Exception as e:
+                logger.warning(f"Invalidation listener failed: {e}")
+    
+    # ============ Background Writer ============
+    
+    def start(self) -> None:
+        """Start the background writer; set_* calls then queue their SETs."""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._drain_writes())
+            logger.info("Portfolio cache writer started")
+    
+    async def flush(self) -> None:
+        """Wait until every queued write has been sent."""
+        if self._writer_task is not None and not self._writer_task.done():
+            await self._write_queue.join()
+    
+    async def stop(self) -> None:
+        """Send pending writes, then stop the background writer."""
+        if self._writer_task is None:
+            return
+        await self.flush()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        logger.info("Portfolio cache writer stopped")
+    
+    async def _drain_writes(self) -> None:
+        """Send queued writes, batching whatever has accumulated into one pipeline."""
+        queue = self._write_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self.redis.set_json_many([(key, data, ttl) for key, data, ttl, _ in batch])
+                projects = [project for *_, project in batch if project is not None]
+                if projects:
+                    await self._publish_invalidation({"projects": projects})
+            except Exception as e:
+                logger.warning(f"Failed to write {len(batch)} queued cache entries: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
     
     # ============ Utility Methods ============
     
@@ -248,22 +476,24 @@ class PortfolioCache:
         results = {}
         
         try:
-            # Warm summary
-            summary = analyzer.get_portfolio_summary()
-            results["summary"] = await self.set_summary(summary)
-            
-            # Warm projects list
+            # Scan once; the summary is derived from the same project list
             projects = analyzer.scan_all_projects()
-            results["projects"] = await self.set_all_projects(projects)
+            summary = analyzer._compute_summary(projects)
             
-            # Warm individual projects (parallel)
-            project_tasks = []
+            # Summary, projects list and individual projects in one round trip
+            items = [
+                (CacheKey.SUMMARY, summary, self.TTL_LONG),
+                (CacheKey.ALL_PROJECTS, projects, self.TTL_MEDIUM),
+            ]
             for project in projects[:10]:  # Limit to top 10 to avoid overwhelming
-                task = self.set_project(project["name"], project)
-                project_tasks.append(task)
+                items.append((CacheKey.project(project["name"]), project, self.TTL_MEDIUM))
             
-            if project_tasks:
-                await asyncio.gather(*project_tasks, return_exceptions=True)
+            stored = await self.redis.set_json_many(items)
+            await self._publish_invalidation(
+                {"projects": [project["name"] for project in projects[:10]]}
+            )
+            results["summary"] = stored[0]
+            results["projects"] = stored[1]
             
             logger.info("Cache warming completed successfully")
             return results
@@ -278,9 +508,9 @@ class PortfolioCache:
             return {"available": False}
         
         keys_to_check = [
-            ("summary", CacheKey.summary()),
-            ("all_projects", CacheKey.all_projects()),
-            ("recommendations", CacheKey.recommendations()),
+            ("summary", CacheKey.SUMMARY),
+            ("all_projects", CacheKey.ALL_PROJECTS),
+            ("recommendations", CacheKey.RECOMMENDATIONS),
         ]
         
         stats = {
@@ -289,12 +519,19 @@ class PortfolioCache:
             "keys": {},
         }
         
-        for name, key in keys_to_check:
-            exists = await self.redis.exists(key)
-            ttl = await self.redis.ttl(key) if exists else None
+        # EXISTS and TTL for every key in one round trip
+        results = await self.redis.execute_pipeline(
+            [("exists", key) for _, key in keys_to_check]
+            + [("ttl", key) for _, key in keys_to_check]
+        )
+        if results is None:
+            return {"available": False}
+        
+        count = len(keys_to_check)
+        for (name, _), exists, ttl in zip(keys_to_check, results[:count], results[count:]):
             stats["keys"][name] = {
                 "cached": bool(exists),
-                "ttl_seconds": ttl,
+                "ttl_seconds": ttl if exists and ttl >= 0 else None,
             }
         
         return stats
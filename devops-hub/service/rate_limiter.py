@@ -5,17 +5,81 @@ Provides configurable rate limiting for API endpoints with graceful degradation
 when Redis is unavailable.
 """
 
+import hashlib
 import os
+import socket
+import struct
 import time
 import logging
-from collections import defaultdict
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Awaitable, Callable, List, Optional, Tuple
 
 from fastapi import HTTPException, Request, status
 
+from service.redis_client import RedisClient, get_redis_client
+
 logger = logging.getLogger(__name__)
 
+# Token bucket refilled at max_requests per window, in a single round trip.
+# ARGV: max_requests, window_ms. Returns {allowed, tokens left}. Redis runs the
+# script atomically and the clock is the server's, so concurrent workers on
+# different hosts share one consistent bucket. An idle key expires once it
+# would have refilled completely, which is the same as a missing one.
+_TOKEN_BUCKET_SCRIPT = """
+local max = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or max
+local ts = tonumber(b[2]) or now
+tokens = math.min(max, tokens + (now - ts) * max / window)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], window)
+return {allowed, math.floor(tokens)}
+"""
+
+# Longest client identifier taken from a proxy header; an IPv6 address is at
+# most 45 characters, so anything longer is forged or padded
+_MAX_CLIENT_ID_LENGTH = 64
+
+
+@lru_cache(maxsize=8192)
+def _parse_forwarded_for(value: str) -> str:
+    """Get the original client from a (truncated) X-Forwarded-For value."""
+    return value.partition(",")[0].strip()
+
+
+# Short endpoint type codes for rate limit keys; other types use their name
+_ENDPOINT_CODES = {"general": "g", "execute": "e"}
+
+
+def _key_prefix(endpoint_type: str) -> str:
+    """Rate limit key prefix for an endpoint type, e.g. "rl:g:"."""
+    return f"rl:{_ENDPOINT_CODES.get(endpoint_type, endpoint_type)}:"
+
+
+@lru_cache(maxsize=8192)
+def _client_number(client_id: str) -> int:
+    """
+    Compact integer form of a client id for rate limit keys.
+
+    IPv4 addresses map to their 32-bit value; anything else (IPv6, "unknown")
+    to a 64-bit blake2b hash, the same on every worker sharing the limits.
+    """
+    try:
+        return struct.unpack("!I", socket.inet_aton(client_id))[0]
+    except OSError:
+        pass
+    return int.from_bytes(hashlib.blake2b(client_id.encode(), digest_size=8).digest(), "big")
+
 
 @dataclass
 class RateLimitConfig:
@@ -25,6 +89,7 @@ class RateLimitConfig:
     window_seconds: int = 60
     execute_requests_per_window: int = 20
     execute_window_seconds: int = 60
+    memory_max_keys: int = 100_000
 
     @classmethod
     def from_env(cls) -> "RateLimitConfig":
@@ -35,28 +100,27 @@ class RateLimitConfig:
             window_seconds=int(os.environ.get("RATE_LIMIT_WINDOW", "60")),
             execute_requests_per_window=int(os.environ.get("RATE_LIMIT_EXECUTE_REQUESTS", "20")),
             execute_window_seconds=int(os.environ.get("RATE_LIMIT_EXECUTE_WINDOW", "60")),
+            memory_max_keys=int(os.environ.get("RATE_LIMIT_MEM_CAP", "100000")),
         )
 
 
 class InMemoryRateLimiter:
     """
-    Simple in-memory rate limiter using sliding window.
+    Simple in-memory rate limiter using a token bucket per key.
+
+    Each bucket holds up to max_requests tokens and refills at max_requests
+    per window, so state per key is two floats however busy the key is.
+    At most max_keys buckets are kept; the least recently used is evicted
+    first, so clients cycling through addresses can't grow memory unbounded.
 
     Used as fallback when Redis is unavailable or for single-instance deployments.
     Note: This doesn't share state across multiple workers/instances.
     """
 
-    def __init__(self):
-        # Structure: {key: [(timestamp, count), ...]}
-        self._requests: Dict[str, list] = defaultdict(list)
-
-    def _cleanup_old_requests(self, key: str, window_seconds: int) -> None:
-        """Remove requests outside the current window."""
-        cutoff = time.time() - window_seconds
-        self._requests[key] = [
-            (ts, count) for ts, count in self._requests[key]
-            if ts > cutoff
-        ]
+    def __init__(self, max_keys: int = 100_000):
+        # Structure: {key: [tokens, last_refill]}, least recently used first
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._max_keys = max_keys
 
     def check_rate_limit(
         self,
@@ -70,20 +134,31 @@ class InMemoryRateLimiter:
         Returns:
             Tuple of (allowed, current_count, remaining)
         """
-        now = time.time()
-        self._cleanup_old_requests(key, window_seconds)
+        now = time.monotonic()
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = [float(max_requests), now]
+            while len(buckets) > self._max_keys:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(key)
 
-        current_count = sum(count for _, count in self._requests[key])
+        # Refill for the time since the last check, capped at a full bucket
+        rate = max_requests / max(window_seconds, 1)
+        bucket[0] = min(max_requests, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
 
-        if current_count >= max_requests:
-            return False, current_count, 0
+        if bucket[0] < 1:
+            return False, max_requests, 0
 
-        self._requests[key].append((now, 1))
-        return True, current_count + 1, max_requests - current_count - 1
+        bucket[0] -= 1
+        remaining = int(bucket[0])
+        return True, max_requests - remaining, remaining
 
     def reset(self, key: str) -> None:
         """Reset rate limit for a key."""
-        self._requests.pop(key, None)
+        self._buckets.pop(key, None)
 
 
 class RateLimiter:
@@ -96,24 +171,29 @@ class RateLimiter:
 
     def __init__(self, config: Optional[RateLimitConfig] = None):
         self.config = config or RateLimitConfig.from_env()
-        self._memory_limiter = InMemoryRateLimiter()
-        self._redis_client = None
+        self._memory_limiter = InMemoryRateLimiter(max_keys=self.config.memory_max_keys)
+        # Bound on first check rather than here, since init_redis() replaces
+        # the global client at startup
+        self._redis_client: Optional[RedisClient] = None
 
     def _get_client_identifier(self, request: Request) -> str:
         """Extract client identifier from request for rate limiting."""
         # Try to get real IP from proxy headers
-        forwarded = request.headers.get("X-Forwarded-For")
+        get_header = request.headers.get
+        forwarded = get_header("X-Forwarded-For")
         if forwarded:
-            # Take the first IP in the chain (original client)
-            return forwarded.split(",")[0].strip()
+            # Take the first IP in the chain (original client); most requests
+            # come from a few clients, so the parse is usually a cache hit
+            return _parse_forwarded_for(forwarded[:_MAX_CLIENT_ID_LENGTH])
 
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = get_header("X-Real-IP")
         if real_ip:
-            return real_ip
+            return real_ip[:_MAX_CLIENT_ID_LENGTH]
 
         # Fall back to direct client IP
-        if request.client:
-            return request.client.host
+        client = request.client
+        if client:
+            return client.host
 
         return "unknown"
 
@@ -124,26 +204,26 @@ class RateLimiter:
         window_seconds: int
     ) -> Tuple[bool, int, int]:
         """Check rate limit using Redis."""
-        try:
-            from service.redis_client import get_redis_client
-            redis = get_redis_client()
-
-            if not redis.is_available:
-                return await self._check_memory_limit(key, max_requests, window_seconds)
+        redis = self._redis_client
+        if redis is None:
+            redis = self._redis_client = get_redis_client()
 
-            # Use Redis INCR with expiry for atomic rate limiting
-            current = await redis.get(key)
-            if current is not None:
-                count = int(current)
-                if count >= max_requests:
-                    return False, count, 0
+        if not redis.is_available:
+            return self._memory_limiter.check_rate_limit(key, max_requests, window_seconds)
 
-            new_count = await redis.increment(key)
-            if new_count == 1:
-                await redis.expire(key, window_seconds)
+        try:
+            result = await redis.run_script(
+                _TOKEN_BUCKET_SCRIPT,
+                keys=(key,),
+                args=(max_requests, max(1, window_seconds * 1000)),
+            )
+            if result is None:
+                return await self._check_memory_limit(key, max_requests, window_seconds)
 
-            remaining = max(0, max_requests - new_count)
-            return True, new_count, remaining
+            allowed, remaining = int(result[0]), int(result[1])
+            if not allowed:
+                return False, max_requests, 0
+            return True, max_requests - remaining, remaining
 
         except Exception as e:
             logger.warning(f"Redis rate limit check failed, using memory: {e}")
@@ -176,20 +256,30 @@ class RateLimiter:
         if not self.config.enabled:
             return
 
-        client_id = self._get_client_identifier(request)
+        max_requests, window_seconds = self.limits_for(endpoint_type)
+        await self._enforce(
+            request, endpoint_type, _key_prefix(endpoint_type), max_requests, window_seconds
+        )
 
-        # Determine limits based on endpoint type
+    def limits_for(self, endpoint_type: str) -> Tuple[int, int]:
+        """Get (max_requests, window_seconds) for an endpoint type."""
         if endpoint_type == "execute":
-            max_requests = self.config.execute_requests_per_window
-            window_seconds = self.config.execute_window_seconds
-        else:
-            max_requests = self.config.requests_per_window
-            window_seconds = self.config.window_seconds
+            return self.config.execute_requests_per_window, self.config.execute_window_seconds
+        return self.config.requests_per_window, self.config.window_seconds
 
-        key = f"ratelimit:{endpoint_type}:{client_id}"
+    async def _enforce(
+        self,
+        request: Request,
+        endpoint_type: str,
+        key_prefix: str,
+        max_requests: int,
+        window_seconds: int,
+    ) -> None:
+        """Count the request against its client's limit, raising 429 once exceeded."""
+        client_id = self._get_client_identifier(request)
 
         allowed, count, remaining = await self._check_redis_limit(
-            key, max_requests, window_seconds
+            f"{key_prefix}{_client_number(client_id)}", max_requests, window_seconds
         )
 
         if not allowed:
@@ -223,14 +313,30 @@ def get_rate_limiter() -> RateLimiter:
     return _rate_limiter
 
 
-# FastAPI dependency functions
-async def rate_limit_general(request: Request) -> None:
-    """FastAPI dependency for general endpoint rate limiting."""
+def make_rate_limit(endpoint_type: str) -> Callable[[Request], Awaitable[None]]:
+    """
+    Build a FastAPI dependency that rate limits one endpoint type.
+
+    The limiter, its limits and the key prefix are resolved once here, so
+    each request only counts the hit. When rate limiting is disabled the
+    dependency does nothing.
+    """
     limiter = get_rate_limiter()
-    await limiter.check_limit(request, "general")
 
+    if not limiter.config.enabled:
+        async def dependency(request: Request) -> None:
+            return None
+        return dependency
 
-async def rate_limit_execute(request: Request) -> None:
-    """FastAPI dependency for execution endpoint rate limiting."""
-    limiter = get_rate_limiter()
-    await limiter.check_limit(request, "execute")
+    max_requests, window_seconds = limiter.limits_for(endpoint_type)
+    key_prefix = _key_prefix(endpoint_type)
+    enforce = limiter._enforce
+
+    async def dependency(request: Request) -> None:
+        await enforce(request, endpoint_type, key_prefix, max_requests, window_seconds)
+    return dependency
+
+
+# FastAPI dependency functions
+rate_limit_general = make_rate_limit("general")
+rate_limit_execute = make_rate_limit("execute")
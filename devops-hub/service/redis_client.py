@@ -6,6 +6,7 @@ The system operates normally without Redis, using it as an optional enhancement.
 """
 
 import asyncio
+import base64
 import functools
 import hashlib
 import json
@@ -14,18 +15,49 @@ import os
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 
 logger = logging.getLogger(__name__)
 
 # Type variable for generic cache decorator
 T = TypeVar("T")
 
+# Use orjson for cached JSON values if available, fall back to json
+try:
+    import orjson
+    HAS_ORJSON = True
+    # Hand datetimes and dataclasses to default=str like json.dumps does, and
+    # allow non-string dict keys, so cached values read back the same
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+except ImportError:
+    HAS_ORJSON = False
+
+# Use zstandard to compress large cached JSON values if available,
+# otherwise store them uncompressed
+try:
+    import zstandard
+    HAS_ZSTD = True
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+except ImportError:
+    HAS_ZSTD = False
+
+# Serialized JSON longer than this is compressed before caching
+_COMPRESS_THRESHOLD = 4096
+# Marks a compressed cached value; JSON text never starts with it. The
+# compressed bytes are base64 encoded, since responses are decoded as UTF-8.
+_COMPRESSED_PREFIX = "z:"
+
 # Try to import redis - make it optional
 try:
     import redis.asyncio as aioredis
     from redis.asyncio import ConnectionPool, Redis
     from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+    from redis.exceptions import NoScriptError as RedisNoScriptError
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
@@ -34,6 +66,42 @@ except ImportError:
     Redis = None
     RedisConnectionError = Exception
     RedisTimeoutError = Exception
+    RedisNoScriptError = Exception
+
+
+def _dump_json(value: Any) -> Union[str, bytes]:
+    """
+    Serialize a value for caching; raises TypeError/ValueError if it can't be.
+
+    Large values are zstd compressed when zstandard is installed.
+    """
+    if HAS_ORJSON:
+        data = orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+    else:
+        data = json.dumps(value, default=str)
+    if HAS_ZSTD and len(data) > _COMPRESS_THRESHOLD:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return _COMPRESSED_PREFIX + base64.b64encode(_ZSTD_COMPRESSOR.compress(data)).decode("ascii")
+    return data
+
+
+def _load_json(raw: Union[str, bytes]) -> Any:
+    """Deserialize a cached value; raises ValueError if it isn't valid JSON."""
+    if isinstance(raw, bytes):
+        compressed = raw.startswith(b"z:")
+    else:
+        compressed = raw.startswith(_COMPRESSED_PREFIX)
+    if compressed:
+        if not HAS_ZSTD:
+            raise ValueError("compressed cache value but zstandard is not installed")
+        try:
+            raw = _ZSTD_DECOMPRESSOR.decompress(base64.b64decode(raw[2:]))
+        except zstandard.ZstdError as e:
+            raise ValueError(f"corrupt compressed cache value: {e}") from e
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 @dataclass
@@ -113,6 +181,8 @@ class RedisClient:
         self._lock = asyncio.Lock()
         self._pubsub_handlers: Dict[str, List[Callable]] = {}
         self._pubsub_task: Optional[asyncio.Task] = None
+        # SHA1 of each Lua script already sent with SCRIPT LOAD
+        self._script_shas: Dict[str, str] = {}
 
     @property
     def is_available(self) -> bool:
@@ -259,7 +329,7 @@ class RedisClient:
     async def set(
         self,
         key: str,
-        value: str,
+        value: Union[str, bytes],
         ttl: Optional[int] = None,
         nx: bool = False,
         xx: bool = False,
@@ -317,10 +387,37 @@ class RedisClient:
         if value is None:
             return None
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return _load_json(value)
+        except ValueError:
             return None
 
+    async def get_json_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Get and deserialize several JSON values with one MGET.
+
+        Returns a value per key, in order; None where the key is missing or
+        not valid JSON, or for every key if Redis is unavailable.
+        """
+        if not keys:
+            return []
+        if not self.is_available:
+            return [None] * len(keys)
+
+        try:
+            raw_values = await self._client.mget(keys)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            logger.warning(f"Redis mget failed for {len(keys)} keys: {e}")
+            self._connected = False
+            return [None] * len(keys)
+
+        values = []
+        for raw in raw_values:
+            try:
+                values.append(None if raw is None else _load_json(raw))
+            except ValueError:
+                values.append(None)
+        return values
+
     async def set_json(
         self,
         key: str,
@@ -329,12 +426,35 @@ class RedisClient:
     ) -> bool:
         """Serialize and set a JSON value in cache."""
         try:
-            json_str = json.dumps(value, default=str)
-            return await self.set(key, json_str, ttl=ttl)
+            return await self.set(key, _dump_json(value), ttl=ttl)
         except (TypeError, ValueError) as e:
             logger.warning(f"Failed to serialize value for key {key}: {e}")
             return False
 
+    async def set_json_many(self, items: Sequence[Tuple[str, Any, Optional[int]]]) -> List[bool]:
+        """
+        Serialize and set several JSON values in one round trip.
+
+        Args:
+            items: (key, value, ttl) tuples; ttl in seconds or None
+
+        Returns a success flag per item, in order.
+        """
+        commands = []
+        positions = []
+        for index, (key, value, ttl) in enumerate(items):
+            try:
+                commands.append(("set", key, _dump_json(value), ttl))
+                positions.append(index)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Failed to serialize value for key {key}: {e}")
+
+        succeeded = [False] * len(items)
+        results = await self.execute_pipeline(commands) if commands else []
+        for index, result in zip(positions, results or []):
+            succeeded[index] = result is not None and result is not False
+        return succeeded
+
     async def increment(self, key: str, amount: int = 1) -> Optional[int]:
         """Increment a counter. Returns new value or None on failure."""
         if not self.is_available:
@@ -372,15 +492,89 @@ class RedisClient:
             self._connected = False
             return None
 
+    async def scan_iter(self, match: str, count: int = 1000) -> AsyncIterator[str]:
+        """
+        Iterate over keys matching a glob pattern.
+
+        Uses incremental SCAN rather than KEYS, so Redis stays responsive on
+        large keyspaces; count is a per-call batch size hint. Yields nothing
+        if Redis is unavailable, and stops early if the connection drops.
+        """
+        if not self.is_available:
+            return
+
+        try:
+            async for key in self._client.scan_iter(match=match, count=count):
+                yield key
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            logger.warning(f"Redis scan failed for pattern {match}: {e}")
+            self._connected = False
+
+    async def execute_pipeline(self, commands: Sequence[Tuple[Any, ...]]) -> Optional[List[Any]]:
+        """
+        Send several commands in one round trip.
+
+        Args:
+            commands: (method name, *args) tuples, e.g. ("exists", key)
+
+        Returns the commands' results in order, or None if Redis is unavailable.
+        The pipeline is not transactional; commands are only batched.
+        """
+        if not self.is_available:
+            return None
+        if not commands:
+            return []
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for name, *args in commands:
+                    getattr(pipe, name)(*args)
+                return await pipe.execute()
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            logger.warning(f"Redis pipeline of {len(commands)} commands failed: {e}")
+            self._connected = False
+            return None
+
+    async def run_script(
+        self,
+        script: str,
+        keys: Sequence[str] = (),
+        args: Sequence[Any] = (),
+    ) -> Optional[Any]:
+        """
+        Run a Lua script atomically with EVALSHA.
+
+        The script is loaded once with SCRIPT LOAD and its SHA cached; if the
+        server has since flushed its script cache it is loaded again.
+
+        Returns the script's result, or None if Redis is unavailable.
+        """
+        if not self.is_available:
+            return None
+
+        try:
+            sha = self._script_shas.get(script)
+            if sha is None:
+                sha = self._script_shas[script] = await self._client.script_load(script)
+            try:
+                return await self._client.evalsha(sha, len(keys), *keys, *args)
+            except RedisNoScriptError:
+                sha = self._script_shas[script] = await self._client.script_load(script)
+                return await self._client.evalsha(sha, len(keys), *keys, *args)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            logger.warning(f"Redis script failed for keys {list(keys)}: {e}")
+            self._connected = False
+            return None
+
     # ============ Pub/Sub Methods ============
 
-    async def publish(self, channel: str, message: Union[str, Dict[str, Any]]) -> int:
+    async def publish(self, channel: str, message: Union[str, bytes, Dict[str, Any]]) -> int:
         """
         Publish a message to a channel.
 
         Args:
             channel: Channel name to publish to
-            message: Message string or dict (will be JSON serialized)
+            message: Message string, pre-encoded bytes, or dict (will be JSON serialized)
 
         Returns number of subscribers that received the message.
         """
@@ -408,9 +602,10 @@ class RedisClient:
             channel: Channel name or pattern (use * for wildcard)
             handler: Callback function(channel, message) called for each message
 
-        Returns True if subscription was successful.
+        Returns True if subscription was successful, False when there is no
+        live connection to listen on.
         """
-        if not REDIS_AVAILABLE:
+        if not self.is_available or self._client is None:
             return False
 
         if channel not in self._pubsub_handlers:
@@ -546,7 +741,7 @@ class RedisPubSubBridge:
                 return
 
             channel = f"{self._channel_prefix}:{event.type}"
-            await self._redis.publish(channel, event.to_dict())
+            await self._redis.publish(channel, event.to_json())
 
         message_bus.subscribe("*", forward_to_redis)
 
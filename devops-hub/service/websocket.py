@@ -116,10 +116,8 @@ class ConnectionManager:
 
     async def _broadcast_event(self, event: Event) -> None:
         """Broadcast an event to all matching connections."""
-        event_data = {
-            "type": "event",
-            "event": event.to_dict(),
-        }
+        # Built on the first match, so unwatched events are never serialized
+        event_data = None
 
         # Get snapshot of connections
         async with self._lock:
@@ -129,6 +127,11 @@ class ConnectionManager:
         disconnected = []
         for connection in connections:
             if connection.matches_event(event):
+                if event_data is None:
+                    event_data = {
+                        "type": "event",
+                        "event": event.to_dict(),
+                    }
                 try:
                     await self._send_message(connection, event_data)
                 except Exception as e:
@@ -2,8 +2,13 @@
 Tests for the message bus.
 """
 
+import asyncio
+import json
+from datetime import datetime
+
 import pytest
 
+from service import message_bus
 from service.message_bus import (
     MessageBus,
     Event,
@@ -43,6 +48,28 @@ class TestEvent:
         assert "data" in d
         assert "timestamp" in d
 
+    def test_event_to_json(self):
+        event = Event(type="test", source="src", data={"x": 1})
+        assert json.loads(event.to_json()) == event.to_dict()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_event_to_json_non_str_keys(self, monkeypatch, use_orjson):
+        if use_orjson and not message_bus.HAS_ORJSON:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(message_bus, "HAS_ORJSON", use_orjson)
+        timestamp = datetime(2024, 5, 1, 12, 30, 15, 250000)
+        event = Event(
+            type="test",
+            source="src",
+            data={1: "a", 2.5: "b", "nested": {3: ["c"]}},
+            timestamp=timestamp,
+        )
+
+        decoded = json.loads(event.to_json())
+
+        assert decoded["data"] == {"1": "a", "2.5": "b", "nested": {"3": ["c"]}}
+        assert decoded["timestamp"] == "2024-05-01T12:30:15.250000"
+
 
 class TestEventType:
     """Tests for EventType enum."""
@@ -113,6 +140,37 @@ class TestMessageBus:
         assert len(received_events) == 1
         assert received_events[0].source == "specific-source"
 
+    @pytest.mark.asyncio
+    async def test_wildcard_with_source_filter(self, bus):
+        received_events = []
+
+        async def handler(event):
+            received_events.append(event)
+
+        bus.subscribe("*", handler, filter_source="specific-source")
+
+        await bus.publish(Event(type="event1", source="specific-source"))
+        await bus.publish(Event(type="event2", source="other-source"))
+
+        assert len(received_events) == 1
+        assert received_events[0].type == "event1"
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_stops_delivery(self, bus):
+        received_events = []
+
+        async def handler(event):
+            received_events.append(event)
+
+        sub_id = bus.subscribe("test.event", handler, filter_source="src")
+        bus.subscribe("test.event", handler)
+        bus.unsubscribe(sub_id)
+
+        await bus.publish(Event(type="test.event", source="src"))
+
+        assert len(received_events) == 1
+        assert bus.get_subscriptions()["test.event"] == 1
+
     def test_unsubscribe(self, bus):
         async def handler(event):
             pass
@@ -225,6 +283,132 @@ class TestMessageBus:
         # Should not raise
         await bus.publish(Event(type="test", source="test"))
 
+    @pytest.mark.asyncio
+    async def test_sync_handler_error_does_not_break_bus(self, bus):
+        received = []
+
+        async def good_handler(event):
+            received.append(event)
+
+        def bad_handler(event):
+            raise ValueError("Handler error")
+
+        bus.subscribe("x", good_handler)
+        bus.subscribe("x", bad_handler)
+        bus.subscribe("x", good_handler)
+
+        # Should not raise, and both good handlers still get the event
+        await bus.publish(Event(type="x", source="test"))
+
+        assert len(received) == 2
+
+    @pytest.mark.asyncio
+    async def test_handler_order(self):
+        bus = MessageBus(concurrent_dispatch=False)
+        order = []
+
+        def handler(name):
+            async def record(event):
+                order.append(name)
+            return record
+
+        bus.subscribe("*", handler("wildcard"))
+        bus.subscribe("test", handler("type-filtered"), filter_source="src")
+        bus.subscribe("*", handler("wildcard-filtered"), filter_source="src")
+        bus.subscribe("test", handler("type-1"))
+        bus.subscribe("test", handler("type-2"))
+
+        await bus.publish(Event(type="test", source="src"))
+
+        assert order == [
+            "type-1",
+            "type-2",
+            "type-filtered",
+            "wildcard",
+            "wildcard-filtered",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_handlers_run_concurrently(self, bus):
+        order = []
+
+        async def slow_handler(event):
+            await asyncio.sleep(0.05)
+            order.append("slow")
+
+        async def fast_handler(event):
+            order.append("fast")
+
+        bus.subscribe("test", slow_handler)
+        bus.subscribe("test", fast_handler)
+
+        await bus.publish(Event(type="test", source="test"))
+
+        assert order == ["fast", "slow"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_dispatch(self):
+        bus = MessageBus(concurrent_dispatch=False)
+        order = []
+
+        async def slow_handler(event):
+            await asyncio.sleep(0.01)
+            order.append("slow")
+
+        async def fast_handler(event):
+            order.append("fast")
+
+        bus.subscribe("test", slow_handler)
+        bus.subscribe("test", fast_handler)
+
+        await bus.publish(Event(type="test", source="test"))
+
+        assert order == ["slow", "fast"]
+
+
+@pytest.mark.skipif(not message_bus.HAS_METRICS, reason="metrics dependencies not installed")
+class TestEventMetrics:
+    """Tests for counting published events in the prometheus metrics."""
+
+    @pytest.fixture
+    def bus(self):
+        return MessageBus()
+
+    @staticmethod
+    def _count(event_type, source):
+        from prometheus_client import REGISTRY
+        value = REGISTRY.get_sample_value(
+            "event_bus_messages_total", {"event_type": event_type, "source": source}
+        )
+        return value or 0.0
+
+    @staticmethod
+    async def _scrape():
+        from service.metrics import metrics_endpoint
+        return (await metrics_endpoint()).body.decode()
+
+    @pytest.mark.asyncio
+    async def test_scrape_reports_published_events(self, bus):
+        await self._scrape()
+        before = self._count("test.metrics", "metrics-src")
+
+        for _ in range(3):
+            await bus.publish(Event(type="test.metrics", source="metrics-src"))
+        body = await self._scrape()
+
+        assert self._count("test.metrics", "metrics-src") == before + 3
+        assert 'event_bus_messages_total{event_type="test.metrics",source="metrics-src"}' in body
+
+    @pytest.mark.asyncio
+    async def test_event_type_enum_labelled_by_value(self, bus):
+        await self._scrape()
+        before = self._count("agent.started", "metrics-agent")
+
+        await bus.emit_agent_started("metrics-agent")
+        await self._scrape()
+
+        assert self._count("agent.started", "metrics-agent") == before + 1
+
 
 class TestMessageBusGlobal:
     """Tests for global message bus."""
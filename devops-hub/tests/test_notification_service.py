@@ -0,0 +1,366 @@
+"""
+Tests for the notification service webhook circuit breaker and retries.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from service import notification_service as ns
+from service.notification_service import SendResult, _send_http_post
+
+
+URL = "https://hooks.example.com/webhook"
+HOST = "hooks.example.com"
+
+
+@pytest.fixture
+def sender(monkeypatch):
+    """Replace the HTTP senders with a stub returning queued results."""
+    ns._breaker_state.clear()
+    ns._host_blocked_until.clear()
+    calls = []
+    results = []
+
+    async def fake_send(url, data, headers, service_name, host):
+        calls.append(url)
+        result = results.pop(0)
+        if isinstance(result, asyncio.Event):
+            await result.wait()
+            return SendResult(success=True, status_code=200)
+        return result
+
+    monkeypatch.setattr(ns, "_send_with_aiohttp", fake_send)
+    monkeypatch.setattr(ns, "_send_with_urllib", fake_send)
+    yield calls, results
+    ns._breaker_state.clear()
+
+
+def _fail():
+    return SendResult(success=False, status_code=503, error="HTTP 503")
+
+
+def _ok():
+    return SendResult(success=True, status_code=200, response="ok")
+
+
+async def _open_circuit(results):
+    results.extend(_fail() for _ in range(ns._BREAKER_FAILURE_THRESHOLD))
+    for _ in range(ns._BREAKER_FAILURE_THRESHOLD):
+        await _send_http_post(URL, {}, "Test")
+
+
+def _expire_cooldown():
+    ns._breaker_state[HOST].opened_at -= ns._BREAKER_COOLDOWN_SECONDS
+
+
+class TestCircuitBreaker:
+    """Tests for the per-host webhook circuit breaker."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold(self, sender):
+        calls, results = sender
+        await _open_circuit(results)
+
+        assert ns._breaker_state[HOST].state == "open"
+        result = await _send_http_post(URL, {}, "Test")
+        assert result == {"success": False, "error": "circuit open"}
+        assert len(calls) == ns._BREAKER_FAILURE_THRESHOLD
+
+    @pytest.mark.asyncio
+    async def test_client_errors_keep_circuit_closed(self, sender):
+        calls, results = sender
+        results.extend(
+            SendResult(success=False, status_code=404, error="HTTP 404")
+            for _ in range(ns._BREAKER_FAILURE_THRESHOLD)
+        )
+        for _ in range(ns._BREAKER_FAILURE_THRESHOLD):
+            await _send_http_post(URL, {}, "Test")
+
+        assert ns._breaker_state.get(HOST) is None
+
+    @pytest.mark.asyncio
+    async def test_successful_probe_closes_circuit(self, sender):
+        calls, results = sender
+        await _open_circuit(results)
+        _expire_cooldown()
+
+        results.append(_ok())
+        result = await _send_http_post(URL, {}, "Test")
+
+        assert result["success"] is True
+        circuit = ns._breaker_state[HOST]
+        assert circuit.state == "closed"
+        assert circuit.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens_circuit(self, sender):
+        calls, results = sender
+        await _open_circuit(results)
+        _expire_cooldown()
+
+        results.append(_fail())
+        await _send_http_post(URL, {}, "Test")
+
+        assert ns._breaker_state[HOST].state == "open"
+        result = await _send_http_post(URL, {}, "Test")
+        assert result["error"] == "circuit open"
+
+    @pytest.mark.asyncio
+    async def test_only_one_probe_while_half_open(self, sender):
+        calls, results = sender
+        await _open_circuit(results)
+        _expire_cooldown()
+
+        gate = asyncio.Event()
+        results.append(gate)
+        probe = asyncio.create_task(_send_http_post(URL, {}, "Test"))
+        await asyncio.sleep(0)
+
+        assert ns._breaker_state[HOST].state == "half_open"
+        result = await _send_http_post(URL, {}, "Test")
+        assert result["error"] == "circuit open"
+
+        gate.set()
+        assert (await probe)["success"] is True
+        assert ns._breaker_state[HOST].state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_reopens_circuit(self, sender):
+        calls, results = sender
+        await _open_circuit(results)
+        _expire_cooldown()
+
+        results.append(asyncio.Event())  # never set
+        probe = asyncio.create_task(_send_http_post(URL, {}, "Test"))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert ns._breaker_state[HOST].state == "open"
+
+        # After the next cooldown a new probe is let through
+        _expire_cooldown()
+        results.append(_ok())
+        assert (await _send_http_post(URL, {}, "Test"))["success"] is True
+        assert ns._breaker_state[HOST].state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_lost_probe_times_out(self, sender):
+        calls, results = sender
+        await _open_circuit(results)
+        _expire_cooldown()
+        assert ns._breaker_allows(HOST) is True
+        circuit = ns._breaker_state[HOST]
+        assert circuit.state == "half_open"
+
+        # No outcome is ever recorded for that probe
+        circuit.probe_started_at -= ns._BREAKER_PROBE_TIMEOUT_SECONDS
+        assert ns._breaker_allows(HOST) is False
+        assert circuit.state == "open"
+
+        _expire_cooldown()
+        assert ns._breaker_allows(HOST) is True
+
+
+class FakeResponse:
+    """Minimal aiohttp response with a status, headers and body."""
+
+    charset = None
+
+    def __init__(self, status, headers=None, body=b""):
+        self.status = status
+        self.headers = headers or {}
+        self.content = asyncio.StreamReader()
+        self.content.feed_data(body)
+        self.content.feed_eof()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """aiohttp session stub replaying queued responses or exceptions."""
+
+    def __init__(self):
+        self.responses = []
+        self.posts = 0
+
+    def post(self, url, data=None, headers=None):
+        self.posts += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Route aiohttp sends to a FakeSession and record retry sleeps."""
+    ns._breaker_state.clear()
+    ns._host_blocked_until.clear()
+    fake = FakeSession()
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        # No concurrency slot may be held while waiting to retry
+        host_semaphore, global_semaphore = ns._webhook_semaphores(HOST)
+        sleeps.append((delay, host_semaphore._value, global_semaphore._value))
+        await real_sleep(0)
+
+    monkeypatch.setattr(ns, "get_http_session", lambda: fake)
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    yield fake, sleeps
+    ns._breaker_state.clear()
+    ns._host_blocked_until.clear()
+
+
+@pytest.fixture
+def no_http_session():
+    """Start and end without a shared aiohttp session."""
+    ns._http_session = None
+    ns._http_session_loop = None
+    yield
+    ns._http_session = None
+    ns._http_session_loop = None
+
+
+async def _new_session():
+    return ns.get_http_session()
+
+
+@pytest.mark.skipif(not ns.HAS_AIOHTTP, reason="aiohttp not installed")
+class TestHttpSession:
+    """Tests for the shared aiohttp session across event loops."""
+
+    def test_session_from_closed_loop_is_closed(self, no_http_session):
+        errors = []
+
+        old = asyncio.run(_new_session())
+
+        async def replace():
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            session = ns.get_http_session()
+            await ns.close_http_session()
+            return session
+
+        new = asyncio.run(replace())
+
+        assert new is not old
+        assert old.closed
+        assert new.closed
+        assert errors == []
+
+    def test_session_from_running_loop_is_closed_there(self, no_http_session):
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever, daemon=True)
+        thread.start()
+        try:
+            old = asyncio.run_coroutine_threadsafe(_new_session(), other).result(5)
+
+            async def replace():
+                session = ns.get_http_session()
+                # The close is scheduled on the other loop; wait for it to run there
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other))
+                await ns.close_http_session()
+                return session
+
+            new = asyncio.run(replace())
+
+            assert new is not old
+            assert old.closed
+        finally:
+            other.call_soon_threadsafe(other.stop)
+            thread.join(5)
+            other.close()
+
+
+@pytest.mark.skipif(not ns.HAS_AIOHTTP, reason="aiohttp not installed")
+class TestRetries:
+    """Tests for webhook retries with backoff and rate limits."""
+
+    @pytest.mark.asyncio
+    async def test_retries_server_error_then_succeeds(self, session):
+        fake, sleeps = session
+        fake.responses.extend([FakeResponse(503), FakeResponse(200, body=b"ok")])
+
+        result = await _send_http_post(URL, {}, "Test")
+
+        assert result == {"success": True, "status_code": 200, "response": "ok"}
+        assert fake.posts == 2
+        assert len(sleeps) == 1
+        delay, host_free, global_free = sleeps[0]
+        assert 0 <= delay <= ns._RETRY_BASE_DELAY * 2
+        assert host_free == ns._WEBHOOK_MAX_PER_HOST
+        assert global_free == ns._WEBHOOK_MAX_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, session):
+        fake, sleeps = session
+        fake.responses.extend(FakeResponse(502) for _ in range(ns._WEBHOOK_MAX_ATTEMPTS))
+
+        result = await _send_http_post(URL, {}, "Test")
+
+        assert result["success"] is False
+        assert result["status_code"] == 502
+        assert fake.posts == ns._WEBHOOK_MAX_ATTEMPTS
+        assert len(sleeps) == ns._WEBHOOK_MAX_ATTEMPTS - 1
+        for attempt, (delay, _, _) in enumerate(sleeps, start=1):
+            assert 0 <= delay <= min(ns._RETRY_MAX_DELAY, ns._RETRY_BASE_DELAY * 2 ** attempt)
+        # One send counts once against the circuit, however many attempts it took
+        assert ns._breaker_state[HOST].failures == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_retried(self, session):
+        fake, sleeps = session
+        fake.responses.extend([asyncio.TimeoutError(), FakeResponse(204)])
+
+        result = await _send_http_post(URL, {}, "Test")
+
+        assert result["success"] is True
+        assert fake.posts == 2
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_not_retried(self, session):
+        fake, sleeps = session
+        fake.responses.append(FakeResponse(404, body=b"missing"))
+
+        result = await _send_http_post(URL, {}, "Test")
+
+        assert result["error"] == "HTTP 404: missing"
+        assert fake.posts == 1
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_retry_waits_for_retry_after(self, session):
+        fake, sleeps = session
+        fake.responses.extend([
+            FakeResponse(429, headers={"Retry-After": "5"}),
+            FakeResponse(200),
+        ])
+
+        result = await _send_http_post(URL, {}, "Test")
+
+        assert result["success"] is True
+        delay, host_free, global_free = sleeps[0]
+        assert 4 < delay <= 5
+        assert host_free == ns._WEBHOOK_MAX_PER_HOST
+        assert global_free == ns._WEBHOOK_MAX_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_wait_holds_no_slot(self, session):
+        fake, sleeps = session
+        ns._host_blocked_until[HOST] = ns.time.monotonic() + 30
+        fake.responses.append(FakeResponse(200))
+
+        assert (await _send_http_post(URL, {}, "Test"))["success"] is True
+        delay, host_free, global_free = sleeps[0]
+        assert 29 < delay <= 30
+        assert host_free == ns._WEBHOOK_MAX_PER_HOST
+        assert global_free == ns._WEBHOOK_MAX_CONCURRENCY
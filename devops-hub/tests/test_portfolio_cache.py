@@ -0,0 +1,258 @@
+"""
+Tests for the portfolio cache.
+"""
+
+import asyncio
+
+import pytest
+
+from service import portfolio_analyzer, portfolio_cache
+from service.portfolio_cache import CacheKey, PortfolioCache
+
+
+class StubRedis:
+    """In-memory RedisClient stand-in recording the calls made to it."""
+
+    def __init__(self, delay=0.01):
+        self.is_available = True
+        self.data = {}
+        self.delay = delay
+        self.gets = []
+        self.batches = []
+        self.error = None
+
+    async def get_json(self, key):
+        self.gets.append(key)
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.data.get(key)
+
+    async def set_json(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+    async def set_json_many(self, items):
+        self.batches.append([key for key, _, _ in items])
+        await asyncio.sleep(self.delay)
+        for key, value, _ in items:
+            self.data[key] = value
+        return [True] * len(items)
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel, message):
+        return 0
+
+
+@pytest.fixture
+def redis():
+    return StubRedis()
+
+
+@pytest.fixture
+def cache(redis):
+    cache = PortfolioCache()
+    cache.redis = redis
+    return cache
+
+
+class TestSingleflight:
+    """Tests for coalescing concurrent lookups."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_lookup(self, cache, redis):
+        results = await asyncio.gather(*(cache.get_project("api") for _ in range(20)))
+
+        assert results == [None] * 20
+        assert redis.gets == [CacheKey.project("api")]
+        assert cache._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_hits_share_result(self, cache, redis):
+        redis.data[CacheKey.SUMMARY] = {"total_projects": 3}
+
+        results = await asyncio.gather(*(cache.get_summary() for _ in range(5)))
+
+        assert results == [{"total_projects": 3}] * 5
+        assert len(redis.gets) == 1
+
+    @pytest.mark.asyncio
+    async def test_different_keys_are_not_coalesced(self, cache, redis):
+        await asyncio.gather(cache.get_project("a"), cache.get_project("b"), cache.get_summary())
+
+        assert sorted(redis.gets) == sorted(
+            [CacheKey.project("a"), CacheKey.project("b"), CacheKey.SUMMARY]
+        )
+
+    @pytest.mark.asyncio
+    async def test_sequential_lookups_are_not_coalesced(self, cache, redis):
+        await cache.get_summary()
+        await cache.get_summary()
+
+        assert len(redis.gets) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_caller(self, cache, redis):
+        redis.error = RuntimeError("boom")
+
+        results = await asyncio.gather(
+            cache.get_summary(), cache.get_summary(), return_exceptions=True
+        )
+
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+        assert len(redis.gets) == 1
+        assert cache._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self, cache, redis):
+        redis.data[CacheKey.SUMMARY] = {"ok": True}
+        first = asyncio.create_task(cache.get_summary())
+        second = asyncio.create_task(cache.get_summary())
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == {"ok": True}
+        assert len(redis.gets) == 1
+
+
+class TestWriteBehind:
+    """Tests for queued writes sent by the background writer."""
+
+    @pytest.mark.asyncio
+    async def test_writes_directly_without_writer(self, cache, redis):
+        assert await cache.set_summary({"a": 1}) is True
+
+        assert redis.data[CacheKey.SUMMARY] == {"a": 1}
+        assert redis.batches == []
+
+    @pytest.mark.asyncio
+    async def test_queued_writes_are_batched(self, cache, redis):
+        cache.start()
+        try:
+            for i in range(100):
+                assert await cache.set_project(f"p{i}", {"i": i}) is True
+            # Nothing has been sent yet; the caller didn't wait on Redis
+            assert redis.data == {}
+
+            await cache.flush()
+
+            assert len(redis.data) == 100
+            assert [len(batch) for batch in redis.batches] == [64, 36]
+        finally:
+            await cache.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_sends_pending_writes(self, cache, redis):
+        cache.start()
+        await cache.set_summary({"a": 1})
+        await cache.stop()
+
+        assert redis.data[CacheKey.SUMMARY] == {"a": 1}
+        assert cache._writer_task is None
+        # After stopping, writes go straight to Redis again
+        await cache.set_summary({"a": 2})
+        assert redis.data[CacheKey.SUMMARY] == {"a": 2}
+
+    @pytest.mark.asyncio
+    async def test_invalidation_waits_for_queued_writes(self, cache, redis):
+        cache.start()
+        try:
+            await cache.set_project("api", {"v": 1})
+            await cache.invalidate_project("api")
+
+            # The queued SET landed before the DEL, so nothing stale remains
+            assert CacheKey.project("api") not in redis.data
+        finally:
+            await cache.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_does_not_stop_writer(self, cache, redis):
+        async def failing(items):
+            raise RuntimeError("connection reset")
+
+        cache.start()
+        try:
+            original = redis.set_json_many
+            redis.set_json_many = failing
+            await cache.set_summary({"a": 1})
+            await cache.flush()
+
+            redis.set_json_many = original
+            await cache.set_summary({"a": 2})
+            await cache.flush()
+
+            assert redis.data[CacheKey.SUMMARY] == {"a": 2}
+        finally:
+            await cache.stop()
+
+
+@pytest.fixture
+def analyzer(cache, monkeypatch, tmp_path):
+    """ProjectAnalyzer on tmp_path whose analysis just counts its runs."""
+    runs = []
+
+    async def fake_git_status(path):
+        return None
+
+    def fake_analyze(self, path, git_status, files):
+        runs.append(path.name)
+        return {"name": path.name, "run": len(runs)}
+
+    monkeypatch.setattr(portfolio_cache, "get_portfolio_cache", lambda: cache)
+    monkeypatch.setattr(portfolio_analyzer.GitStatus, "create", fake_git_status)
+    monkeypatch.setattr(portfolio_analyzer.ProjectAnalyzer, "_scan_files", lambda self, path: None)
+    monkeypatch.setattr(portfolio_analyzer.ProjectAnalyzer, "analyze_project", fake_analyze)
+    portfolio_analyzer._analysis_cache.clear()
+    (tmp_path / "api").mkdir()
+    (tmp_path / "web").mkdir()
+    yield portfolio_analyzer.ProjectAnalyzer(tmp_path), runs
+    portfolio_analyzer._analysis_cache.clear()
+
+
+class TestAnalysisInvalidation:
+    """Tests for dropping in-process analyses when the cache is invalidated."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_project_reuses_analysis(self, analyzer, tmp_path):
+        project_analyzer, runs = analyzer
+
+        await project_analyzer.analyze_project_async(tmp_path / "api")
+        await project_analyzer.analyze_project_async(tmp_path / "api")
+
+        assert runs == ["api"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_project_reruns_analysis(self, analyzer, cache, tmp_path):
+        project_analyzer, runs = analyzer
+        await project_analyzer.analyze_project_async(tmp_path / "api")
+        await project_analyzer.analyze_project_async(tmp_path / "web")
+
+        await cache.invalidate_project("api")
+        result = await project_analyzer.analyze_project_async(tmp_path / "api")
+        await project_analyzer.analyze_project_async(tmp_path / "web")
+
+        assert result["run"] == 3
+        assert runs == ["api", "web", "api"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_all_drops_every_analysis(self, analyzer, cache, tmp_path):
+        project_analyzer, runs = analyzer
+        await project_analyzer.analyze_project_async(tmp_path / "api")
+
+        await cache.invalidate_all_projects()
+
+        assert portfolio_analyzer._analysis_cache == {}
+
+    @pytest.mark.asyncio
+    async def test_invalidation_from_another_process(self, analyzer, cache, redis, tmp_path):
+        project_analyzer, runs = analyzer
+        await project_analyzer.analyze_project_async(tmp_path / "api")
+
+        # The other process deletes the shared key, then publishes the event
+        del redis.data[CacheKey.project("api")]
+        cache._on_invalidation(cache.INVALIDATION_CHANNEL, '{"project": "api"}')
+        await project_analyzer.analyze_project_async(tmp_path / "api")
+
+        assert runs == ["api", "api"]
@@ -0,0 +1,202 @@
+"""
+Tests for the rate limiter.
+"""
+
+import asyncio
+
+import pytest
+
+from service import rate_limiter as rl
+from service.rate_limiter import InMemoryRateLimiter, RateLimitConfig, RateLimiter
+
+
+class FakeClock:
+    """Stands in for the time module so bucket refills are deterministic."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rl, "time", fake)
+    return fake
+
+
+class StubRedis:
+    """Minimal RedisClient stand-in for exercising the fallback paths."""
+
+    def __init__(self, available=True, result=None, error=None):
+        self.is_available = available
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    async def run_script(self, script, keys=(), args=()):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class TestInMemoryRateLimiter:
+    """Tests for the in-memory token bucket limiter."""
+
+    def test_allows_up_to_limit_then_denies(self, clock):
+        limiter = InMemoryRateLimiter()
+        results = [limiter.check_rate_limit("k", 3, 60) for _ in range(4)]
+
+        assert results == [(True, 1, 2), (True, 2, 1), (True, 3, 0), (False, 3, 0)]
+
+    def test_refills_over_time(self, clock):
+        limiter = InMemoryRateLimiter()
+        for _ in range(3):
+            limiter.check_rate_limit("k", 3, 60)
+        assert limiter.check_rate_limit("k", 3, 60)[0] is False
+
+        # 3 requests per 60s is one token every 20s
+        clock.now += 20
+        assert limiter.check_rate_limit("k", 3, 60)[0] is True
+        assert limiter.check_rate_limit("k", 3, 60)[0] is False
+
+    def test_refill_is_capped_at_limit(self, clock):
+        limiter = InMemoryRateLimiter()
+        limiter.check_rate_limit("k", 3, 60)
+        clock.now += 3600
+
+        results = [limiter.check_rate_limit("k", 3, 60)[0] for _ in range(4)]
+        assert results == [True, True, True, False]
+
+    def test_keys_are_independent(self, clock):
+        limiter = InMemoryRateLimiter()
+        limiter.check_rate_limit("a", 1, 60)
+
+        assert limiter.check_rate_limit("a", 1, 60)[0] is False
+        assert limiter.check_rate_limit("b", 1, 60)[0] is True
+
+    def test_evicts_least_recently_used(self, clock):
+        limiter = InMemoryRateLimiter(max_keys=2)
+        limiter.check_rate_limit("a", 1, 60)
+        limiter.check_rate_limit("b", 1, 60)
+        limiter.check_rate_limit("a", 1, 60)  # "a" is now most recently used
+        limiter.check_rate_limit("c", 1, 60)
+
+        assert list(limiter._buckets) == ["a", "c"]
+        # "b" starts again with a full bucket
+        assert limiter.check_rate_limit("b", 1, 60)[0] is True
+
+    def test_reset(self, clock):
+        limiter = InMemoryRateLimiter()
+        limiter.check_rate_limit("k", 1, 60)
+        limiter.reset("k")
+
+        assert limiter.check_rate_limit("k", 1, 60)[0] is True
+
+
+class TestRateLimiterFallback:
+    """Tests for falling back to the in-memory limiter."""
+
+    @pytest.fixture
+    def limiter(self, clock):
+        return RateLimiter(RateLimitConfig(enabled=True))
+
+    @pytest.mark.asyncio
+    async def test_uses_memory_when_redis_unavailable(self, limiter):
+        limiter._redis_client = StubRedis(available=False)
+
+        results = [await limiter._check_redis_limit("k", 1, 60) for _ in range(2)]
+
+        assert results == [(True, 1, 0), (False, 1, 0)]
+        assert limiter._redis_client.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_uses_memory_when_script_returns_nothing(self, limiter):
+        limiter._redis_client = StubRedis(result=None)
+
+        assert await limiter._check_redis_limit("k", 2, 60) == (True, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_uses_memory_when_script_fails(self, limiter):
+        limiter._redis_client = StubRedis(error=RuntimeError("WRONGTYPE"))
+
+        assert await limiter._check_redis_limit("k", 2, 60) == (True, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_maps_script_result(self, limiter):
+        limiter._redis_client = StubRedis(result=[1, 7])
+        assert await limiter._check_redis_limit("k", 10, 60) == (True, 3, 7)
+
+        limiter._redis_client = StubRedis(result=[0, 0])
+        assert await limiter._check_redis_limit("k", 10, 60) == (False, 10, 0)
+
+
+class TestTokenBucketScript:
+    """Tests for the Redis token bucket script, run against fakeredis."""
+
+    @pytest.fixture
+    def redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        from service.redis_client import RedisClient, RedisConfig
+
+        client = RedisClient(RedisConfig())
+        client._client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        client._connected = True
+        return client
+
+    async def _hit(self, redis, key, max_requests, window_ms):
+        allowed, remaining = await redis.run_script(
+            rl._TOKEN_BUCKET_SCRIPT, keys=(key,), args=(max_requests, window_ms)
+        )
+        return allowed, remaining
+
+    @pytest.mark.asyncio
+    async def test_depletes_then_denies(self, redis):
+        results = [await self._hit(redis, "rl:g:1", 3, 60000) for _ in range(4)]
+
+        assert results == [(1, 2), (1, 1), (1, 0), (0, 0)]
+
+    @pytest.mark.asyncio
+    async def test_expires_after_window(self, redis):
+        await self._hit(redis, "rl:g:1", 3, 60000)
+        ttl = await redis._client.pttl("rl:g:1")
+
+        assert 0 < ttl <= 60000
+
+    @pytest.mark.asyncio
+    async def test_refills(self, redis):
+        # 10 requests per second is one token every 100ms
+        for _ in range(10):
+            await self._hit(redis, "rl:g:1", 10, 1000)
+        assert (await self._hit(redis, "rl:g:1", 10, 1000))[0] == 0
+
+        await asyncio.sleep(0.25)
+        assert (await self._hit(redis, "rl:g:1", 10, 1000))[0] == 1
+
+
+class TestKeys:
+    """Tests for rate limit key construction."""
+
+    def test_key_prefix(self):
+        assert rl._key_prefix("general") == "rl:g:"
+        assert rl._key_prefix("execute") == "rl:e:"
+        assert rl._key_prefix("other") == "rl:other:"
+
+    def test_client_number(self):
+        assert rl._client_number("192.168.1.100") == 3232235876
+        assert rl._client_number("::1") == rl._client_number("::1")
+        assert rl._client_number("::1") != rl._client_number("::2")
+
+    @pytest.mark.asyncio
+    async def test_disabled_dependency_is_noop(self, monkeypatch):
+        monkeypatch.setattr(rl, "_rate_limiter", RateLimiter(RateLimitConfig(enabled=False)))
+        dependency = rl.make_rate_limit("general")
+
+        assert await dependency(None) is None
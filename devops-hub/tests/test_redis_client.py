@@ -0,0 +1,75 @@
+"""
+Tests for the Redis client's cached JSON encoding.
+"""
+
+import json
+
+import pytest
+
+from service import redis_client as rc
+from service.redis_client import _dump_json, _load_json
+
+
+SMALL = {"name": "project", "health": 90}
+LARGE = {"projects": [{"name": f"project-{i}", "signals": ["stripe", "saas"]} for i in range(500)]}
+
+
+class TestJsonEncodingWithoutCompression:
+    """Tests for cached JSON values with compression unavailable."""
+
+    @pytest.fixture(autouse=True)
+    def no_zstd(self, monkeypatch):
+        monkeypatch.setattr(rc, "HAS_ZSTD", False)
+
+    def test_round_trip(self):
+        assert _load_json(_dump_json(SMALL)) == SMALL
+        assert _load_json(_dump_json(LARGE)) == LARGE
+
+    def test_large_values_stored_as_plain_json(self):
+        raw = _dump_json(LARGE)
+        text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+        assert json.loads(text) == LARGE
+
+    def test_compressed_value_is_rejected(self):
+        with pytest.raises(ValueError):
+            _load_json("z:KLUv/SAEIQAAe30=")
+
+    def test_invalid_json_is_rejected(self):
+        with pytest.raises(ValueError):
+            _load_json("{not json")
+
+
+class TestJsonEncodingWithCompression:
+    """Tests for cached JSON values compressed with zstd."""
+
+    @pytest.fixture(autouse=True)
+    def zstd(self):
+        pytest.importorskip("zstandard")
+
+    def test_small_values_are_not_compressed(self):
+        raw = _dump_json(SMALL)
+        text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+        assert json.loads(text) == SMALL
+
+    def test_large_values_are_compressed(self):
+        raw = _dump_json(LARGE)
+
+        assert raw.startswith(rc._COMPRESSED_PREFIX)
+        assert len(raw) < len(json.dumps(LARGE))
+        raw.encode("ascii")  # stored as text, safe for decoded responses
+
+    def test_round_trip(self):
+        assert _load_json(_dump_json(LARGE)) == LARGE
+
+    def test_round_trip_from_bytes(self):
+        # Clients configured with decode_responses=False return bytes
+        assert _load_json(_dump_json(LARGE).encode("ascii")) == LARGE
+
+    def test_reads_uncompressed_values(self):
+        assert _load_json(json.dumps(LARGE)) == LARGE
+
+    def test_corrupt_value_is_rejected(self):
+        with pytest.raises(ValueError):
+            _load_json("z:AAAAAAAA")